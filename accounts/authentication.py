@@ -1,14 +1,19 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 from bson import ObjectId
+from bson.errors import InvalidId
+from django.conf import settings
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from accounts.revocation import issued_at_millis, revocations, revoke_user
+from accounts.user_cache import cached_user, invalidate_user
 from core.db import get_collection
 
 
-@dataclass
+@dataclass(frozen=True)
 class MongoUser:
     id: str
     email: str
@@ -21,6 +26,50 @@ class MongoUser:
         return True
 
 
+def load_user(user_id):
+    """Fetch an active user from Mongo, or ``None`` if missing or not active."""
+    try:
+        user = get_collection('users').find_one({'_id': ObjectId(user_id)})
+    except InvalidId:
+        return None
+    if not user or user.get('status') != 'ACTIVE':
+        return None
+    return MongoUser(
+        id=str(user['_id']),
+        email=user['email'],
+        role=user['role'],
+        full_name=user.get('full_name', ''),
+        status=user['status'],
+    )
+
+
+def user_from_claims(access):
+    """Build the user from a validated access token alone (``AUTH_STATELESS``).
+
+    Tokens are only issued to active users; status and role changes made
+    through ``update_user`` revoke the tokens that carry the old claims.
+    """
+    if not access.get('email') or not access.get('role'):
+        return None
+    return MongoUser(
+        id=str(access['user_id']),
+        email=access['email'],
+        role=access['role'],
+        full_name=access.get('full_name', ''),
+        status='ACTIVE',
+    )
+
+
+def update_user(user_id, **fields):
+    """Change a user's status/role/etc., drop the stale cached copy and revoke claim-bearing tokens."""
+    fields['updated_at'] = datetime.utcnow()
+    result = get_collection('users').update_one({'_id': ObjectId(user_id)}, {'$set': fields})
+    invalidate_user(user_id)
+    if 'status' in fields or 'role' in fields:
+        revoke_user(user_id)
+    return result
+
+
 class MongoJWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
         auth_header = request.headers.get('Authorization')
@@ -39,14 +88,11 @@ class MongoJWTAuthentication(BaseAuthentication):
             raise AuthenticationFailed('Invalid token.') from exc
         if not user_id:
             raise AuthenticationFailed('Invalid token payload.')
-        user = get_collection('users').find_one({'_id': ObjectId(user_id)})
-        if not user or user.get('status') != 'ACTIVE':
+        if revocations.is_revoked(str(user_id), access.get('jti'), issued_at_millis(access)):
+            raise AuthenticationFailed('Token has been revoked.')
+        mongo_user = user_from_claims(access) if settings.AUTH_STATELESS else None
+        if mongo_user is None:
+            mongo_user = cached_user(str(user_id), load_user)
+        if mongo_user is None:
             raise AuthenticationFailed('User is inactive.')
-        mongo_user = MongoUser(
-            id=str(user['_id']),
-            email=user['email'],
-            role=user['role'],
-            full_name=user.get('full_name', ''),
-            status=user['status'],
-        )
         return mongo_user, access
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from pymongo import ASCENDING
+
+from core.indexing import Index, QueryShape
+
+INDEXES = [
+    Index('users', (('email', ASCENDING),), unique=True),
+    Index('signup_requests', (('email', ASCENDING),), unique=True),
+    # Only pending requests are ever listed; the partial index stays small.
+    Index(
+        'signup_requests',
+        (('status', ASCENDING), ('_id', ASCENDING)),
+        partial={'status': 'PENDING'},
+        name='pending_signup_requests',
+    ),
+    # Revocations are dropped once every token they cover has expired.
+    Index('revoked_tokens', (('expires_at', ASCENDING),), expire_after=0),
+]
+
+QUERIES = [
+    QueryShape('users', {'email': 'probe@example.com'}, source='LoginView.post'),
+    QueryShape('signup_requests', {'email': 'probe@example.com', 'status': 'PENDING'}, source='SignupView.post'),
+    QueryShape('signup_requests', {'status': 'PENDING'}, source='PendingSignupView.get'),
+    QueryShape(
+        'revoked_tokens', {'expires_at': {'$gt': datetime(2024, 1, 1)}}, source='accounts.revocation.RevocationList'
+    ),
+]
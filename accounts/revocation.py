@@ -0,0 +1,120 @@
+"""In-memory token denylist mirrored from the ``revoked_tokens`` collection."""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+
+from core.db import get_collection
+from core.tasks import submit
+
+# Claim carrying the millisecond issue time; ``iat`` is whole seconds, too
+# coarse to tell a login just after a revocation from the tokens it voids.
+ISSUED_AT_MS_CLAIM = 'iat_ms'
+_EPOCH = datetime(1970, 1, 1)
+
+
+def epoch_millis(moment=None):
+    """Milliseconds since the epoch for a naive UTC datetime (now by default)."""
+    return ((moment or datetime.utcnow()) - _EPOCH) // timedelta(milliseconds=1)
+
+
+def issued_at_millis(token):
+    """A token's issue time in milliseconds, falling back to ``iat`` for older tokens."""
+    issued_at = token.get(ISSUED_AT_MS_CLAIM)
+    return issued_at if issued_at is not None else token.get('iat', 0) * 1000
+
+
+class RevocationList:
+    """Revoked ``jti``s plus, per user id, the time (epoch ms) up to which their tokens are void.
+
+    The first check loads the list synchronously; afterwards it is reloaded
+    on the background pool every ``AUTH_REVOCATION_REFRESH_SECONDS``, so
+    checks never wait on Mongo.
+    """
+
+    def __init__(self):
+        self._jtis = frozenset()
+        self._users = {}
+        self._loaded_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        jtis, users = set(), {}
+        cursor = get_collection('revoked_tokens').find(
+            {'expires_at': {'$gt': datetime.utcnow()}}, {'kind': 1, 'value': 1, 'revoked_at': 1}
+        )
+        for entry in cursor:
+            if entry['kind'] == 'jti':
+                jtis.add(entry['value'])
+            else:
+                revoked_at = epoch_millis(entry['revoked_at'])
+                users[entry['value']] = max(revoked_at, users.get(entry['value'], 0))
+        with self._lock:
+            self._jtis = frozenset(jtis)
+            self._users = users
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+
+    def _refresh(self):
+        try:
+            self._load()
+        except Exception:
+            with self._lock:
+                self._refreshing = False
+            raise
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None:
+            self._load()
+            return
+        if time.monotonic() - self._loaded_at < settings.AUTH_REVOCATION_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        if not submit(self._refresh):
+            with self._lock:
+                self._refreshing = False
+
+    def is_revoked(self, user_id, jti, issued_at):
+        """``issued_at`` is in epoch milliseconds, as returned by ``issued_at_millis``."""
+        self._ensure_fresh()
+        if jti in self._jtis:
+            return True
+        revoked_at = self._users.get(user_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def add(self, kind, value, revoked_at):
+        with self._lock:
+            if kind == 'jti':
+                self._jtis = self._jtis | {value}
+            else:
+                self._users = {**self._users, value: epoch_millis(revoked_at)}
+
+
+revocations = RevocationList()
+
+
+def _revoke(kind, value, expires_at):
+    # BSON dates keep milliseconds; truncate now so memory and Mongo agree.
+    revoked_at = datetime.utcnow()
+    revoked_at = revoked_at.replace(microsecond=revoked_at.microsecond // 1000 * 1000)
+    get_collection('revoked_tokens').insert_one(
+        {'kind': kind, 'value': value, 'revoked_at': revoked_at, 'expires_at': expires_at}
+    )
+    revocations.add(kind, value, revoked_at)
+
+
+def revoke_token(jti, expires_at):
+    """Void one token (by ``jti``) until it would have expired anyway."""
+    _revoke('jti', jti, expires_at)
+
+
+def revoke_user(user_id):
+    """Void every token issued to ``user_id`` so far, e.g. after a role or status change."""
+    expires_at = datetime.utcnow() + api_settings.ACCESS_TOKEN_LIFETIME
+    _revoke('user', str(user_id), expires_at)
@@ -0,0 +1,74 @@
+"""Per-process TTL cache of authenticated users, keyed by user id."""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A small thread-safe LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_users = TTLCache(settings.USER_CACHE_MAX_ENTRIES)
+
+
+def cached_user(user_id, load):
+    """Return the cached user for ``user_id``, calling ``load(user_id)`` on a miss.
+
+    ``load`` returns a user or ``None`` for a missing/inactive account; ``None``
+    is cached for the shorter ``USER_CACHE_NEGATIVE_TTL_SECONDS``.
+    """
+    user = _users.get(user_id)
+    if user is _MISSING:
+        user = load(user_id)
+        ttl = settings.USER_CACHE_TTL_SECONDS if user is not None else settings.USER_CACHE_NEGATIVE_TTL_SECONDS
+        if ttl > 0:
+            _users.set(user_id, user, ttl)
+    return user
+
+
+def invalidate_user(user_id):
+    """Drop ``user_id`` from this process's cache after its status or role changes.
+
+    Other workers pick the change up when their entry expires.
+    """
+    _users.pop(str(user_id))
+
+
+def clear_user_cache():
+    _users.clear()
@@ -10,10 +10,14 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts.authentication import update_user
 from accounts.permissions import MakerOnly
+from accounts.revocation import ISSUED_AT_MS_CLAIM, epoch_millis, revoke_token
 from core.db import get_collection
 
 EMAIL_PATTERN = re.compile(r'^[A-Za-z0-9._%+-]+@doggzi\.com$')
+USER_ROLES = {'SUPERUSER', 'MAKER', 'HR', 'MD', 'FINANCE', 'EMPLOYEE'}
+USER_STATUSES = {'ACTIVE', 'INACTIVE'}
 
 
 def _validate_doggzi_email(email):
@@ -65,6 +69,8 @@ class LoginView(APIView):
         refresh['user_id'] = str(user['_id'])
         refresh['email'] = user['email']
         refresh['role'] = user['role']
+        refresh['full_name'] = user.get('full_name', '')
+        refresh[ISSUED_AT_MS_CLAIM] = epoch_millis()
         access = refresh.access_token
         profile = {
             'id': str(user['_id']),
@@ -76,6 +82,12 @@ class LoginView(APIView):
         return Response({'access': str(access), 'refresh': str(refresh), 'user': profile})
 
 
+class LogoutView(APIView):
+    def post(self, request):
+        revoke_token(request.auth['jti'], datetime.utcfromtimestamp(request.auth['exp']))
+        return Response({'message': 'Logged out.'})
+
+
 class PendingSignupView(APIView):
     permission_classes = [MakerOnly]
 
@@ -140,3 +152,23 @@ class RejectSignupView(APIView):
         if result.matched_count == 0:
             return Response({'error': 'Signup request not found.'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'message': 'Signup request rejected.'})
+
+
+class UserAccessView(APIView):
+    permission_classes = [MakerOnly]
+
+    def post(self, request, user_id):
+        if not ObjectId.is_valid(user_id):
+            return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+        fields = {field: request.data[field] for field in ('role', 'status') if request.data.get(field)}
+        if not fields:
+            return Response({'error': 'role or status is required'}, status=status.HTTP_400_BAD_REQUEST)
+        for field, allowed in (('role', USER_ROLES), ('status', USER_STATUSES)):
+            if field in fields and fields[field] not in allowed:
+                return Response(
+                    {'error': f"{field} must be one of: {', '.join(sorted(allowed))}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if not update_user(user_id, **fields).matched_count:
+            return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'message': 'User updated.'})
@@ -0,0 +1,13 @@
+from pymongo import ASCENDING
+
+from core.indexing import Index, QueryShape
+
+INDEXES = [
+    Index('employees', (('official_email', ASCENDING),)),
+    Index('salary_slips', (('employee_email', ASCENDING),)),
+]
+
+QUERIES = [
+    QueryShape('employees', {'official_email': 'probe@example.com'}, source='EmployeeProfileView.get'),
+    QueryShape('salary_slips', {'employee_email': 'probe@example.com'}, source='SalarySlipView.get'),
+]
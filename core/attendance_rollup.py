@@ -0,0 +1,147 @@
+"""Per-candidate, per-month attendance counters maintained incrementally.
+
+Counters are advanced when a summary is read, not when attendance is
+appended: each read counts only the rows the worker's row cache gained since
+the previous read, so rows written by any worker are picked up.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+
+from core.hrms import ATTENDANCE_FILE, UNDATED_PARTITION, ExcelConfig, cached_rows, iter_rows
+
+STATUS_COUNTERS = {
+    "Present": "present",
+    "Absent": "absent",
+    "Leave": "leave",
+    "Half Day": "half_day",
+    "Remote": "remote",
+}
+
+
+class _PartitionRollup:
+    def __init__(self):
+        self.rows: list[dict] | None = None
+        self.counted = 0
+        self.counts: Counter = Counter()
+
+
+_rollups: dict[str, _PartitionRollup] = {}
+_sealed_counts: dict[str, Counter] = {}
+_lock = threading.Lock()
+
+
+def _count(rows) -> Counter:
+    # One Python-level pass building a (candidate_id, status) tuple per row;
+    # callers only pass rows not yet counted, except on a full recount.
+    return Counter((str(row.get("candidate_id", "")), str(row.get("status", ""))) for row in rows)
+
+
+def _summary_path(partition: ExcelConfig) -> Path:
+    return partition.path.with_name(f".{partition.path.stem}.summary.json")
+
+
+def _write_summary(partition: ExcelConfig, counts: Counter) -> None:
+    payload = {}
+    for (candidate_id, status_value), total in counts.items():
+        payload.setdefault(candidate_id, {})[status_value] = total
+    temp_path = partition.path.with_name(f".{partition.path.stem}.summary.json.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle)
+    os.replace(temp_path, _summary_path(partition))
+
+
+def _read_summary(partition: ExcelConfig) -> Counter | None:
+    try:
+        with _summary_path(partition).open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except FileNotFoundError:
+        return None
+    return Counter(
+        {
+            (candidate_id, status_value): total
+            for candidate_id, statuses in payload.items()
+            for status_value, total in statuses.items()
+        }
+    )
+
+
+def _sealed_partition_counts(partition: ExcelConfig) -> Counter:
+    # Sealed months never change: read the persisted summary (writing it once
+    # if the month was sealed before summaries existed) and keep it for good.
+    month = partition.path.stem
+    counts = _sealed_counts.get(month)
+    if counts is None:
+        counts = _read_summary(partition)
+        if counts is None:
+            counts = _count(iter_rows(partition))
+            _write_summary(partition, counts)
+        _sealed_counts[month] = counts
+    return counts
+
+
+def _open_partition_counts(partition: ExcelConfig) -> Counter:
+    rows = cached_rows(partition)
+    rollup = _rollups.setdefault(partition.path.stem, _PartitionRollup())
+    if rollup.rows is not rows:
+        rollup.rows, rollup.counted, rollup.counts = rows, 0, Counter()
+    if rollup.counted < len(rows):
+        end = len(rows)
+        rollup.counts.update(_count(rows[rollup.counted:end]))
+        rollup.counted = end
+    return rollup.counts
+
+
+def partition_counts(partition: ExcelConfig) -> Counter:
+    with _lock:
+        if partition.seal_path.exists():
+            return _sealed_partition_counts(partition)
+        return _open_partition_counts(partition)
+
+
+def monthly_summary(
+    *,
+    candidate_id: str | None = None,
+    start_month: str | None = None,
+    end_month: str | None = None,
+) -> list[dict]:
+    """Attendance counts per candidate and month, optionally for one candidate or month range."""
+    summaries = []
+    for partition in ATTENDANCE_FILE.partitions(start_month, end_month):
+        per_candidate: dict[str, dict] = {}
+        for (row_candidate, status_value), total in partition_counts(partition).items():
+            if candidate_id and row_candidate != candidate_id:
+                continue
+            summary = per_candidate.get(row_candidate)
+            if summary is None:
+                summary = per_candidate[row_candidate] = {
+                    "candidate_id": row_candidate,
+                    "month": partition.path.stem,
+                    **dict.fromkeys(STATUS_COUNTERS.values(), 0),
+                    "total": 0,
+                }
+            counter = STATUS_COUNTERS.get(status_value)
+            if counter:
+                summary[counter] += total
+            summary["total"] += total
+        summaries.extend(per_candidate[key] for key in sorted(per_candidate))
+    return summaries
+
+
+def rebuild_sealed_summaries() -> list[str]:
+    """Recount every sealed month from its workbook and rewrite its summary file."""
+    rebuilt = []
+    for month in ATTENDANCE_FILE.months():
+        partition = ATTENDANCE_FILE.partition(month)
+        if month == UNDATED_PARTITION or not partition.seal_path.exists():
+            continue
+        counts = _count(iter_rows(partition))
+        _write_summary(partition, counts)
+        with _lock:
+            _sealed_counts[month] = counts
+        rebuilt.append(month)
+    return rebuilt
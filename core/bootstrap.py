@@ -0,0 +1,55 @@
+"""One-off deploy bootstrap and a cheap, non-blocking Mongo readiness probe."""
+import logging
+import socket
+import time
+from datetime import datetime
+
+from core.db import ensure_indexes, ensure_maker_user, get_client, get_db, ping_mongo
+from core.tasks import submit
+
+logger = logging.getLogger(__name__)
+
+READINESS_TTL_SECONDS = 30
+
+_readiness = {'ok': None, 'checked_at': float('-inf'), 'pending': False}
+
+
+def run_bootstrap():
+    """Ping Mongo, build the registered indexes and seed the superuser.
+
+    Runs once per deploy (``manage.py bootstrap``) rather than in every
+    process's ``AppConfig.ready``.
+    """
+    started = time.monotonic()
+    ping_mongo()
+    ensure_indexes()
+    ensure_maker_user()
+    get_db().bootstrap.update_one(
+        {'_id': 'bootstrap'},
+        {'$set': {'completed_at': datetime.utcnow(), 'host': socket.gethostname()}},
+        upsert=True,
+    )
+    return time.monotonic() - started
+
+
+def _check_readiness():
+    try:
+        get_client().admin.command('ping')
+        ok = True
+    except Exception as exc:
+        logger.warning('MongoDB readiness check failed: %s', exc)
+        ok = False
+    _readiness.update(ok=ok, checked_at=time.monotonic(), pending=False)
+
+
+def mongo_readiness():
+    """Last known Mongo reachability (``True``/``False``/``None`` if never checked).
+
+    A stale result schedules a ping on the background pool; callers never
+    wait on the network.
+    """
+    if not _readiness['pending'] and time.monotonic() - _readiness['checked_at'] > READINESS_TTL_SECONDS:
+        _readiness['pending'] = True
+        if not submit(_check_readiness):
+            _readiness['pending'] = False
+    return _readiness['ok']
@@ -1,24 +1,66 @@
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
-from pymongo import MongoClient, ASCENDING
+from pymongo import MongoClient
+
+from core.mongo_metrics import command_listener
 
 logger = logging.getLogger(__name__)
 
 _client = None
+_client_lock = threading.Lock()
+
+
+def _forget_client():
+    # A MongoClient is not fork-safe: a child must never reuse the parent's
+    # sockets or monitor threads, so it builds its own client on first use.
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_client)
 
 
 def get_client():
     global _client
     if _client is None:
-        if not settings.MONGO_URI:
-            raise RuntimeError('MONGO_URI is not configured.')
-        _client = MongoClient(settings.MONGO_URI)
+        with _client_lock:
+            if _client is None:
+                if not settings.MONGO_URI:
+                    raise RuntimeError('MONGO_URI is not configured.')
+                _client = MongoClient(
+                    settings.MONGO_URI,
+                    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS or None,
+                    connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS or None,
+                    event_listeners=[command_listener] if settings.MONGO_COMMAND_METRICS else [],
+                )
     return _client
 
 
+def warm_up_client():
+    """Open ``MONGO_MIN_POOL_SIZE`` connections now instead of on the first requests.
+
+    Concurrent pings each check out their own pooled connection, so the pool
+    is filled with live, authenticated sockets before the worker takes traffic.
+    """
+    client = get_client()
+    connections = max(settings.MONGO_MIN_POOL_SIZE, 1)
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix='mongo-warmup') as executor:
+        list(executor.map(lambda _: client.admin.command('ping'), range(connections)))
+    logger.info('MongoDB pool warmed with %s connections (pid %s).', connections, os.getpid())
+
+
 def get_db():
     client = get_client()
     return client[settings.MONGO_DB_NAME]
@@ -28,6 +70,13 @@ def get_collection(name):
     return get_db()[name]
 
 
+def with_string_ids(documents):
+    """Yield documents from a cursor with ``_id`` replaced by a string ``id``."""
+    for document in documents:
+        document['id'] = str(document.pop('_id'))
+        yield document
+
+
 def ping_mongo():
     try:
         client = get_client()
@@ -39,13 +88,12 @@ def ping_mongo():
 
 
 def ensure_indexes():
+    """Build every index declared in the apps' ``indexes.py`` modules."""
+    from core.indexing import registered_indexes
+
     db = get_db()
-    db.users.create_index([('email', ASCENDING)], unique=True)
-    db.signup_requests.create_index([('email', ASCENDING)], unique=True)
-    db.employees.create_index([('employee_code', ASCENDING)], unique=True)
-    db.salary_limits.create_index([('designation', ASCENDING)], unique=True)
-    db.appraisals.create_index([('status', ASCENDING)])
-    db.promotions.create_index([('status', ASCENDING)])
+    for index in registered_indexes():
+        db[index.collection].create_index(list(index.keys), **index.options())
 
 
 def ensure_maker_user():
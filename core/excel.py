@@ -1,8 +1,18 @@
+import hashlib
+import tempfile
+from datetime import date, datetime
+from functools import lru_cache
 from io import BytesIO
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from openpyxl import Workbook, load_workbook
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Exports larger than this spill from memory to a temporary file.
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
 
 
 def workbook_from_rows(rows: Iterable[dict]):
@@ -24,20 +34,73 @@ def excel_response(workbook: Workbook, filename: str):
     stream.seek(0)
     response = HttpResponse(
         stream.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        content_type=XLSX_CONTENT_TYPE,
     )
     response['Content-Disposition'] = f'attachment; filename={filename}'
     return response
 
 
-def load_rows_from_upload(file_obj):
-    workbook = load_workbook(filename=file_obj)
-    sheet = workbook.active
-    rows = list(sheet.iter_rows(values_only=True))
-    if not rows:
-        return []
-    headers = [header or '' for header in rows[0]]
-    data_rows = []
-    for row in rows[1:]:
-        data_rows.append({headers[idx]: value for idx, value in enumerate(row)})
-    return data_rows
+@lru_cache(maxsize=None)
+def _template(headers: tuple):
+    workbook = workbook_from_rows([dict.fromkeys(headers, '')])
+    stream = BytesIO()
+    workbook.save(stream)
+    # Saved workbooks embed a timestamp, so the ETag hashes the headers to agree across workers.
+    etag = '"%s"' % hashlib.sha256('\x1f'.join(headers).encode('utf-8')).hexdigest()[:32]
+    return stream.getvalue(), etag
+
+
+def template_response(request, headers: Iterable[str], filename: str):
+    """Serve a blank template built once per process, answering ``If-None-Match`` with 304."""
+    content, etag = _template(tuple(headers))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type=XLSX_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename={filename}'
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=settings.TEMPLATE_CACHE_MAX_AGE)
+    return response
+
+
+def _cell_value(value):
+    if value is None or isinstance(value, (str, int, float, bool, date, datetime)):
+        return value
+    return str(value)
+
+
+def stream_excel_response(rows: Iterable[dict], filename: str):
+    """Write ``rows`` (e.g. a live Mongo cursor) with a write-only workbook and stream the file.
+
+    Write-only worksheets flush each row to disk as it is appended, so memory
+    stays flat regardless of how many rows the cursor yields. Columns come
+    from the first row, as in ``workbook_from_rows``.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    headers = None
+    for row in rows:
+        if headers is None:
+            headers = list(row.keys())
+            sheet.append(headers)
+        sheet.append([_cell_value(row.get(header, '')) for header in headers])
+    stream = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    workbook.save(stream)
+    stream.seek(0)
+    return FileResponse(stream, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+
+def iter_rows_from_upload(file_obj) -> Iterator[dict]:
+    """Yield one dict per data row, parsing the sheet lazily in read-only mode."""
+    workbook = load_workbook(filename=file_obj, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        headers = [header or '' for header in header_row]
+        for row in rows:
+            item = dict.fromkeys(headers)
+            item.update(zip(headers, row))
+            yield item
+    finally:
+        workbook.close()
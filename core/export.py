@@ -0,0 +1,84 @@
+"""Streaming list exports (xlsx, csv, ndjson) straight from a Mongo cursor."""
+import csv
+import io
+from itertools import islice
+
+from bson import ObjectId
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.db import with_string_ids
+from core.excel import stream_excel_response
+
+# Documents fetched per cursor round trip and encoded per yielded chunk.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {'true', 'xlsx', 'csv', 'ndjson'}
+
+
+class ExportJSONEncoder(JSONEncoder):
+    """DRF's encoder (ISO datetimes, decimals, UUIDs) that also writes ObjectIds as strings."""
+
+    def default(self, obj):
+        if isinstance(obj, ObjectId):
+            return str(obj)
+        return super().default(obj)
+
+
+def _batches(rows, size=EXPORT_BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _csv_value(encoder, value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        return encoder.encode(value)
+    return encoder.default(value)
+
+
+def iter_ndjson(rows):
+    encoder = ExportJSONEncoder(ensure_ascii=False)
+    for batch in _batches(rows):
+        yield ''.join(encoder.encode(row) + '\n' for row in batch).encode('utf-8')
+
+
+def iter_csv(rows):
+    """Yield CSV bytes; columns come from the first row, as in the xlsx export."""
+    encoder = ExportJSONEncoder(ensure_ascii=False)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    headers = None
+    for batch in _batches(rows):
+        for row in batch:
+            if headers is None:
+                headers = list(row.keys())
+                writer.writerow(headers)
+            writer.writerow([_csv_value(encoder, row.get(header)) for header in headers])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _streaming_response(chunks, content_type, filename):
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+def export_response(cursor, export_format, basename):
+    """Stream ``cursor`` in the requested ``?export=`` format (``true`` means xlsx)."""
+    rows = with_string_ids(cursor.batch_size(EXPORT_BATCH_SIZE))
+    if export_format == 'csv':
+        return _streaming_response(iter_csv(rows), 'text/csv; charset=utf-8', f'{basename}.csv')
+    if export_format == 'ndjson':
+        return _streaming_response(iter_ndjson(rows), 'application/x-ndjson', f'{basename}.ndjson')
+    return stream_excel_response(rows, f'{basename}.xlsx')
@@ -1,23 +1,122 @@
 from __future__ import annotations
 
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 from uuid import uuid4
 
 from django.conf import settings
 from openpyxl import Workbook, load_workbook
+from openpyxl.packaging.custom import StringProperty
 
+from core import hrms_mongo
+from core.tasks import submit
+
+
+logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(settings.BASE_DIR) / "data" / "hrms"
 DOCUMENTS_DIR = Path(settings.BASE_DIR) / "candidates"
+# Content-addressed store; candidate document paths are hard links into it.
+BLOBS_DIR = DOCUMENTS_DIR / ".blobs"
+
+# Name of the custom document property recording the last journal segment
+# folded into a workbook, so a crash between saving the workbook and deleting
+# the segment never replays rows twice.
+JOURNAL_SEGMENT_PROPERTY = "journal_segment"
 
 
 @dataclass(frozen=True)
 class ExcelConfig:
     path: Path
     headers: tuple[str, ...]
+    key: str | None = None
+    indexes: tuple[str, ...] = ()
+    collection: str | None = None
+    natural_key: tuple[str, ...] = ()
+
+    @property
+    def journal_path(self) -> Path:
+        return self.path.with_suffix(".jsonl")
+
+    @property
+    def seal_path(self) -> Path:
+        return self.path.with_name(f".{self.path.stem}.sealed")
+
+    def segment_paths(self) -> list[Path]:
+        return sorted(self.path.parent.glob(f"{self.path.stem}.*.segment.jsonl"))
+
+
+UNDATED_PARTITION = "undated"
+
+
+@dataclass(frozen=True)
+class PartitionedConfig:
+    """A workbook split into one ``ExcelConfig`` per month of ``partition_field``."""
+
+    directory: Path
+    headers: tuple[str, ...]
+    partition_field: str
+    key: str | None = None
+    indexes: tuple[str, ...] = ()
+    collection: str | None = None
+    natural_key: tuple[str, ...] = ()
+
+    def partition(self, month: str) -> ExcelConfig:
+        return ExcelConfig(
+            self.directory / f"{month}.xlsx",
+            self.headers,
+            key=self.key,
+            indexes=self.indexes,
+            collection=self.collection,
+            natural_key=self.natural_key,
+        )
+
+    def partition_for(self, row: dict) -> ExcelConfig:
+        return self.partition(partition_month(row.get(self.partition_field)) or UNDATED_PARTITION)
+
+    def months(self) -> list[str]:
+        if not self.directory.exists():
+            return []
+        names = {
+            path.name.split(".", 1)[0]
+            for path in self.directory.iterdir()
+            if not path.name.startswith(".") and path.suffix in (".xlsx", ".jsonl")
+        }
+        return sorted(names)
+
+    def partitions(self, start: str | None = None, end: str | None = None) -> list[ExcelConfig]:
+        """Partitions overlapping the inclusive ``start``/``end`` date range."""
+        if start is None and end is None:
+            return [self.partition(month) for month in self.months()]
+        selected = []
+        for month in self.months():
+            if month == UNDATED_PARTITION:
+                continue
+            if start is not None and month < start[:7]:
+                continue
+            if end is not None and month > end[:7]:
+                continue
+            selected.append(self.partition(month))
+        return selected
+
+
+class PartitionSealed(Exception):
+    pass
 
 
 CANDIDATE_HEADERS = (
@@ -62,9 +161,70 @@ ATTENDANCE_HEADERS = (
     "submitted_at",
 )
 
-CANDIDATES_FILE = ExcelConfig(DATA_DIR / "candidates.xlsx", CANDIDATE_HEADERS)
-ONBOARDING_FILE = ExcelConfig(DATA_DIR / "onboarding.xlsx", ONBOARDING_HEADERS)
-ATTENDANCE_FILE = ExcelConfig(DATA_DIR / "attendance.xlsx", ATTENDANCE_HEADERS)
+CANDIDATES_FILE = ExcelConfig(
+    DATA_DIR / "candidates.xlsx",
+    CANDIDATE_HEADERS,
+    key="candidate_id",
+    indexes=("selection_status", "position_applied_for", "final_status"),
+    collection="hrms_candidates",
+    natural_key=("candidate_id",),
+)
+ONBOARDING_FILE = ExcelConfig(
+    DATA_DIR / "onboarding.xlsx",
+    ONBOARDING_HEADERS,
+    indexes=("candidate_id",),
+    collection="hrms_onboarding",
+    natural_key=("candidate_id", "submitted_at"),
+)
+ATTENDANCE_FILE = PartitionedConfig(
+    DATA_DIR / "attendance",
+    ATTENDANCE_HEADERS,
+    "attendance_date",
+    key="attendance_id",
+    indexes=("candidate_id", "status"),
+    collection="hrms_attendance",
+    natural_key=("attendance_id",),
+)
+# Single-file attendance workbook used before monthly partitioning; split it
+# into partitions with ``manage.py partition_attendance``.
+LEGACY_ATTENDANCE_FILE = ExcelConfig(DATA_DIR / "attendance.xlsx", ATTENDANCE_HEADERS, key="attendance_id")
+
+
+def date_key(value) -> str:
+    """Normalize a date cell (ISO string, date or datetime) to ``YYYY-MM-DD``."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    try:
+        parsed = datetime.strptime(str(value or "").strip()[:10], "%Y-%m-%d")
+    except ValueError:
+        return ""
+    return parsed.strftime("%Y-%m-%d")
+
+
+def partition_month(value) -> str:
+    return date_key(value)[:7]
+
+
+def _configs(config, start: str | None = None, end: str | None = None) -> list[ExcelConfig]:
+    if isinstance(config, PartitionedConfig):
+        return config.partitions(start, end)
+    if start is not None or end is not None:
+        raise TypeError(f"{config.path.name} is not partitioned by date.")
+    return [config]
+
+
+def _in_range(config, rows: Iterable[dict], start: str | None, end: str | None) -> list[dict]:
+    if start is None and end is None:
+        return list(rows)
+    selected = []
+    for row in rows:
+        value = date_key(row.get(config.partition_field))
+        if start is not None and value < start:
+            continue
+        if end is not None and value > end:
+            continue
+        selected.append(row)
+    return selected
 
 
 def ensure_workbook(config: ExcelConfig) -> None:
@@ -74,30 +234,513 @@ def ensure_workbook(config: ExcelConfig) -> None:
     workbook = Workbook()
     sheet = workbook.active
     sheet.append(list(config.headers))
-    workbook.save(config.path)
+    # Readers take no lock, so publish the blank workbook atomically as the
+    # fold step does rather than let them open a half-written zip.
+    temp_path = config.path.with_name(f".{config.path.name}.tmp")
+    workbook.save(temp_path)
+    os.replace(temp_path, config.path)
 
 
-def load_rows(config: ExcelConfig) -> list[dict]:
+@contextmanager
+def _file_lock(config: ExcelConfig, name: str, *, blocking: bool = True) -> Iterator[bool]:
+    lock_path = config.path.with_name(f".{config.path.stem}.{name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as handle:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(handle, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _journal_record(config: ExcelConfig, row: dict) -> dict:
+    record = {}
+    for header in config.headers:
+        value = row.get(header, "")
+        record[header] = value if value is not None else ""
+    return record
+
+
+def _read_journal(path: Path, config: ExcelConfig, offset: int = 0) -> tuple[list[dict], int, int | None]:
+    """Read complete journal lines from ``offset``; returns rows, end offset and inode."""
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return [], offset, None
+    rows = []
+    with handle:
+        inode = os.fstat(handle.fileno()).st_ino
+        handle.seek(offset)
+        for line in handle:
+            if not line.endswith(b"\n"):
+                # Torn or in-flight tail; it is picked up once the write completes.
+                break
+            offset += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping corrupt journal line in %s", path)
+                continue
+            rows.append({header: record.get(header, "") for header in config.headers})
+    return rows, offset, inode
+
+
+def _workbook_segment(workbook: Workbook) -> str:
+    properties = workbook.custom_doc_props
+    if JOURNAL_SEGMENT_PROPERTY in properties.names:
+        return properties[JOURNAL_SEGMENT_PROPERTY].value
+    return ""
+
+
+def _set_workbook_segment(workbook: Workbook, segment_name: str) -> None:
+    properties = workbook.custom_doc_props
+    if JOURNAL_SEGMENT_PROPERTY in properties.names:
+        del properties[JOURNAL_SEGMENT_PROPERTY]
+    properties.append(StringProperty(name=JOURNAL_SEGMENT_PROPERTY, value=segment_name))
+
+
+def _storage_generation(config: ExcelConfig) -> tuple:
+    try:
+        stat = config.path.stat()
+        workbook_state = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    except FileNotFoundError:
+        workbook_state = None
+    return workbook_state, tuple(segment.name for segment in config.segment_paths())
+
+
+def _iter_sheet_rows(workbook: Workbook) -> Iterator[dict]:
+    rows = workbook.active.iter_rows(values_only=True)
+    header_row = next(rows, None)
+    if header_row is None:
+        return
+    headers = [str(header) for header in header_row]
+    for row in rows:
+        item = dict.fromkeys(headers, "")
+        item.update((header, value) for header, value in zip(headers, row) if value is not None)
+        yield item
+
+
+def _load_workbook_rows(config: ExcelConfig) -> tuple[list[dict], str]:
     if not config.path.exists():
-        return []
-    workbook = load_workbook(config.path)
-    sheet = workbook.active
-    rows = list(sheet.iter_rows(values_only=True))
-    if not rows:
-        return []
-    headers = [str(header) for header in rows[0]]
-    data_rows = []
-    for row in rows[1:]:
-        data_rows.append({headers[idx]: (value if value is not None else "") for idx, value in enumerate(row)})
-    return data_rows
+        return [], ""
+    workbook = load_workbook(config.path, read_only=True)
+    try:
+        return list(_iter_sheet_rows(workbook)), _workbook_segment(workbook)
+    finally:
+        workbook.close()
+
+
+def iter_rows(config) -> Iterator[dict]:
+    """Stream every row without caching, holding one row in memory at a time."""
+    if isinstance(config, PartitionedConfig):
+        for partition in config.partitions():
+            yield from iter_rows(partition)
+        return
+    folded = ""
+    if config.path.exists():
+        workbook = load_workbook(config.path, read_only=True)
+        try:
+            folded = _workbook_segment(workbook)
+            yield from _iter_sheet_rows(workbook)
+        finally:
+            workbook.close()
+    for segment in config.segment_paths():
+        if segment.name > folded:
+            yield from _read_journal(segment, config)[0]
+    yield from _read_journal(config.journal_path, config)[0]
+
+
+class _RowCache:
+    """Per-process parsed rows of one workbook, indexed by key and secondary fields.
+
+    The workbook and sealed journal segments are only re-parsed when their
+    generation (mtime/size/inode, segment names) changes, e.g. after another
+    worker compacts. Rows appended to the live journal by any worker are
+    picked up incrementally by reading from the last consumed byte offset.
+    """
+
+    def __init__(self, config: ExcelConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.generation = None
+        self.journal_inode = None
+        self.journal_offset = 0
+        self.rows: list[dict] = []
+        # Indexes hold row positions, which stay stable because rows are only appended.
+        self.by_key: dict[str, int] = {}
+        self.by_field: dict[str, dict[str, list[int]]] = {}
+
+    def refresh(self) -> None:
+        with self.lock:
+            generation = _storage_generation(self.config)
+            if generation != self.generation or not self._tail_journal():
+                self._rebuild()
+
+    def _tail_journal(self) -> bool:
+        """Consume rows appended since the last read; False means a rebuild is needed."""
+        try:
+            stat = self.config.journal_path.stat()
+        except FileNotFoundError:
+            return self.journal_offset == 0
+        if self.journal_inode is not None and stat.st_ino != self.journal_inode:
+            return False
+        if stat.st_size < self.journal_offset:
+            return False
+        if stat.st_size == self.journal_offset:
+            return True
+        return self._read_tail()
+
+    def _read_tail(self) -> bool:
+        rows, offset, inode = _read_journal(self.config.journal_path, self.config, self.journal_offset)
+        if inode is None or (self.journal_inode is not None and inode != self.journal_inode):
+            return False
+        self.journal_inode = inode
+        self.journal_offset = offset
+        self._add(rows)
+        return True
+
+    def _rebuild(self) -> None:
+        # Compaction may swap the workbook and remove segments mid-read; retry
+        # until the set of files we read is stable so no row is missed or doubled.
+        for _ in range(3):
+            generation = _storage_generation(self.config)
+            rows, folded = _load_workbook_rows(self.config)
+            for segment in self.config.segment_paths():
+                if segment.name > folded:
+                    rows.extend(_read_journal(segment, self.config)[0])
+            journal_rows, offset, inode = _read_journal(self.config.journal_path, self.config)
+            rows.extend(journal_rows)
+            if _storage_generation(self.config) == generation:
+                break
+        by_key: dict[str, int] = {}
+        by_field = {field: defaultdict(list) for field in self.config.indexes}
+        self._index(rows, 0, by_key, by_field)
+        # Swap in complete structures so concurrent readers never see a partial rebuild.
+        self.rows, self.by_key, self.by_field = rows, by_key, by_field
+        self.generation = generation
+        self.journal_inode = inode
+        self.journal_offset = offset
+
+    def _add(self, rows: list[dict]) -> None:
+        start = len(self.rows)
+        self.rows.extend(rows)
+        self._index(rows, start, self.by_key, self.by_field)
+
+    def _index(self, rows: list[dict], start: int, by_key: dict, by_field: dict) -> None:
+        key = self.config.key
+        for position, row in enumerate(rows, start):
+            if key:
+                by_key[str(row.get(key, ""))] = position
+            for field, index in by_field.items():
+                index[str(row.get(field, ""))].append(position)
+
 
+_caches: dict[Path, _RowCache] = {}
+_caches_lock = threading.Lock()
 
-def append_row(config: ExcelConfig, row: dict) -> None:
+
+def _cache(config: ExcelConfig) -> _RowCache:
+    with _caches_lock:
+        cache = _caches.get(config.path)
+        if cache is None:
+            cache = _caches[config.path] = _RowCache(config)
+    cache.refresh()
+    return cache
+
+
+def invalidate_cache(config: ExcelConfig | None = None) -> None:
+    with _caches_lock:
+        if config is None:
+            _caches.clear()
+        else:
+            _caches.pop(config.path, None)
+
+
+def load_rows(config, *, start: str | None = None, end: str | None = None) -> list[dict]:
+    """Return all rows; the row dicts are shared with the cache and must not be mutated.
+
+    ``start``/``end`` (inclusive ISO dates) only apply to a ``PartitionedConfig``
+    and skip every partition outside the range.
+    """
+    rows = []
+    for partition in _configs(config, start, end):
+        rows.extend(_cache(partition).rows)
+    return _in_range(config, rows, start, end)
+
+
+def cached_rows(config: ExcelConfig) -> list[dict]:
+    """The live, append-only row list of one workbook's cache (do not mutate).
+
+    A different list object is returned after the cache was rebuilt, which
+    lets callers that consume rows incrementally detect when to start over.
+    """
+    return _cache(config).rows
+
+
+def find_row(config, key_value: str) -> dict | None:
+    if settings.HRMS_MONGO_READS:
+        return hrms_mongo.find_row(config, key_value)
+    for partition in _configs(config):
+        cache = _cache(partition)
+        rows, by_key = cache.rows, cache.by_key
+        position = by_key.get(str(key_value))
+        if position is not None:
+            return rows[position]
+    return None
+
+
+def filter_rows(config, field: str, value: str, *, start: str | None = None, end: str | None = None) -> list[dict]:
+    rows, _ = query_rows(config, filters={field: value}, start=start, end=end, limit=None)
+    return rows
+
+
+def _encode_cursor(partition: str, position: int) -> str:
+    return urlsafe_b64encode(f"{partition}:{position}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        partition, position = urlsafe_b64decode(padded.encode()).decode().rsplit(":", 1)
+        return partition, int(position)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def query_rows(
+    config,
+    *,
+    filters: dict | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = 100,
+    descending: bool = False,
+) -> tuple[list[dict], str | None]:
+    """Return one page of rows matching ``filters`` plus the cursor of the next page.
+
+    Equality filters on indexed fields are answered from the smallest matching
+    index; the cursor records the partition and row position of the last row
+    returned, so each page costs O(page size) regardless of history length.
+    """
+    filters = {field: str(value) for field, value in (filters or {}).items()}
+    if settings.HRMS_MONGO_READS:
+        return hrms_mongo.query_rows(
+            config, filters=filters, start=start, end=end, cursor=cursor, limit=limit, descending=descending
+        )
+    resume = _decode_cursor(cursor) if cursor else None
+    partitions = _configs(config, start, end)
+    if descending:
+        partitions.reverse()
+    page: list[dict] = []
+    for partition in partitions:
+        name = partition.path.stem
+        if resume is not None and name != resume[0] and (name > resume[0]) == descending:
+            continue
+        cache = _cache(partition)
+        rows, by_field = cache.rows, cache.by_field
+        indexed = [by_field[field].get(value, []) for field, value in filters.items() if field in by_field]
+        positions = min(indexed, key=len) if indexed else range(len(rows))
+        if resume is not None and name == resume[0]:
+            if descending:
+                positions = positions[:bisect_left(positions, resume[1])]
+            else:
+                positions = positions[bisect_right(positions, resume[1]):]
+        for position in reversed(positions) if descending else positions:
+            row = rows[position]
+            if any(str(row.get(field, "")) != value for field, value in filters.items()):
+                continue
+            if not _in_range(config, [row], start, end):
+                continue
+            page.append(row)
+            if limit is not None and len(page) >= limit:
+                return page, _encode_cursor(name, position)
+    return page, None
+
+
+class _Batch:
+    def __init__(self):
+        self.payloads: list[bytes] = []
+        self.done = threading.Event()
+        self.error: Exception | None = None
+        self.journal_size = 0
+
+
+class _GroupCommitWriter:
+    """Coalesces concurrent appends to one journal into a single locked write.
+
+    The first caller to join an open batch becomes its leader: it waits for the
+    previous batch to finish committing (during which more rows join), then
+    writes the whole batch with one ``write``/``fsync`` under the cross-process
+    journal lock. Followers block until their batch is durable.
+    """
+
+    def __init__(self, config: ExcelConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.commit_lock = threading.Lock()
+        self.open_batch = _Batch()
+
+    def append(self, payload: bytes) -> int:
+        with self.lock:
+            batch = self.open_batch
+            batch.payloads.append(payload)
+            leader = len(batch.payloads) == 1
+        if leader:
+            with self.commit_lock:
+                window = settings.HRMS_GROUP_COMMIT_WINDOW_MS
+                if window:
+                    time.sleep(window / 1000)
+                with self.lock:
+                    self.open_batch = _Batch()
+                self._commit(batch)
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.journal_size
+
+    def _commit(self, batch: _Batch) -> None:
+        data = b"".join(batch.payloads)
+        try:
+            with _file_lock(self.config, "journal"):
+                if self.config.seal_path.exists():
+                    raise PartitionSealed(f"{self.config.path.stem} is sealed and no longer accepts rows.")
+                fd = os.open(self.config.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    start_size = os.fstat(fd).st_size
+                    try:
+                        while data:
+                            data = data[os.write(fd, data):]
+                        if settings.HRMS_JOURNAL_FSYNC:
+                            os.fsync(fd)
+                    except OSError:
+                        # Drop the partial batch so the next append starts on a clean line.
+                        os.ftruncate(fd, start_size)
+                        raise
+                    batch.journal_size = os.fstat(fd).st_size
+                finally:
+                    os.close(fd)
+        except Exception as exc:
+            batch.error = exc
+        finally:
+            batch.done.set()
+
+
+_writers: dict[Path, _GroupCommitWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _writer(config: ExcelConfig) -> _GroupCommitWriter:
+    with _writers_lock:
+        writer = _writers.get(config.path)
+        if writer is None:
+            writer = _writers[config.path] = _GroupCommitWriter(config)
+        return writer
+
+
+def append_row(config, row: dict) -> None:
+    append_rows(config, [row])
+
+
+def append_rows(config, rows: Iterable[dict]) -> None:
+    """Journal ``rows`` in one commit per target workbook (or partition)."""
+    grouped: dict[Path, tuple[ExcelConfig, list[dict]]] = {}
+    for row in rows:
+        target = config.partition_for(row) if isinstance(config, PartitionedConfig) else config
+        grouped.setdefault(target.path, (target, []))[1].append(_journal_record(target, row))
+    for target, records in grouped.values():
+        target.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        journal_size = _writer(target).append(payload.encode("utf-8"))
+        if settings.HRMS_MONGO_DUAL_WRITE:
+            _mirror_to_mongo(target, records)
+        if journal_size >= settings.HRMS_JOURNAL_MAX_BYTES:
+            # Folding rewrites the whole workbook, so it never runs on the
+            # appending request; when the pool is full the next append (or
+            # ``materialize_hrms``) picks it up.
+            submit(materialize, target, blocking=False)
+
+
+def _mirror_to_mongo(config: ExcelConfig, records: list[dict]) -> None:
+    # The journal stays the source of truth during the migration; a failed
+    # mirror write is repaired by re-running ``migrate_hrms_to_mongo``.
+    try:
+        hrms_mongo.upsert_rows(config, records)
+    except Exception as exc:
+        logger.exception("Mirroring %s rows to MongoDB failed: %s", config.collection, exc)
+
+
+def materialize(config, *, blocking: bool = True) -> int:
+    """Fold journaled rows into the workbook and return how many were added."""
+    if isinstance(config, PartitionedConfig):
+        return sum(materialize(partition, blocking=blocking) for partition in config.partitions())
+    with _file_lock(config, "compact", blocking=blocking) as acquired:
+        if not acquired:
+            return 0
+        return _materialize_locked(config)
+
+
+def _materialize_locked(config: ExcelConfig) -> int:
+    with _file_lock(config, "journal"):
+        journal = config.journal_path
+        if journal.exists() and journal.stat().st_size:
+            journal.rename(config.path.with_name(f"{config.path.stem}.{time.time_ns():020d}.segment.jsonl"))
     ensure_workbook(config)
+    segments = config.segment_paths()
+    if not segments:
+        return 0
     workbook = load_workbook(config.path)
-    sheet = workbook.active
-    sheet.append([row.get(header, "") for header in config.headers])
-    workbook.save(config.path)
+    folded = _workbook_segment(workbook)
+    pending = [segment for segment in segments if segment.name > folded]
+    folded_rows = 0
+    if pending:
+        sheet = workbook.active
+        for segment in pending:
+            for row in _read_journal(segment, config)[0]:
+                sheet.append([row[header] for header in config.headers])
+                folded_rows += 1
+        _set_workbook_segment(workbook, pending[-1].name)
+        temp_path = config.path.with_name(f".{config.path.name}.tmp")
+        workbook.save(temp_path)
+        os.replace(temp_path, config.path)
+    for segment in segments:
+        segment.unlink(missing_ok=True)
+    if folded_rows:
+        logger.info("Materialized %s journaled rows into %s", folded_rows, config.path.name)
+    return folded_rows
+
+
+def seal(config: ExcelConfig) -> int:
+    """Fold a partition's journal, then mark it and its workbook read-only."""
+    with _file_lock(config, "compact"):
+        with _file_lock(config, "journal"):
+            config.seal_path.touch()
+        folded_rows = _materialize_locked(config)
+        config.path.chmod(0o444)
+    logger.info("Sealed %s", config.path.name)
+    return folded_rows
+
+
+def seal_expired_partitions(config: PartitionedConfig, today: date | None = None) -> list[str]:
+    """Seal monthly partitions once ``HRMS_ATTENDANCE_SEAL_AFTER_DAYS`` have passed since month end."""
+    today = today or datetime.utcnow().date()
+    cutoff = (today - timedelta(days=settings.HRMS_ATTENDANCE_SEAL_AFTER_DAYS)).strftime("%Y-%m")
+    sealed = []
+    for month in config.months():
+        if month == UNDATED_PARTITION or month >= cutoff:
+            continue
+        partition = config.partition(month)
+        if partition.seal_path.exists():
+            continue
+        seal(partition)
+        sealed.append(month)
+    return sealed
 
 
 def create_candidate_id() -> str:
@@ -105,12 +748,94 @@ def create_candidate_id() -> str:
 
 
 def candidate_exists(candidate_id: str) -> dict | None:
-    for row in load_rows(CANDIDATES_FILE):
-        if row.get("candidate_id") == candidate_id:
-            return row
+    return find_row(CANDIDATES_FILE, candidate_id)
+
+
+def _blob_path(digest: str) -> Path:
+    return BLOBS_DIR / digest[:2] / digest
+
+
+def _publish_blob(temp_path: str, digest: str) -> Path:
+    blob = _blob_path(digest)
+    if blob.exists():
+        os.unlink(temp_path)
+        return blob
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    # Blobs are shared by every candidate that uploaded the same bytes.
+    os.chmod(temp_path, 0o444)
+    os.replace(temp_path, blob)
+    return blob
+
+
+def _disk_path(file_obj) -> Path | None:
+    # Django's temporary upload file, or an open file such as an onboarding
+    # spool entry wrapped in ``File``.
+    if hasattr(file_obj, "temporary_file_path"):
+        return Path(file_obj.temporary_file_path())
+    name = getattr(getattr(file_obj, "file", None), "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return Path(name)
     return None
 
 
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def store_blob(file_obj) -> Path:
+    """Store an upload once under its SHA-256 digest and return the blob path."""
+    BLOBS_DIR.mkdir(parents=True, exist_ok=True)
+    source = _disk_path(file_obj)
+    if source is not None:
+        # Already on disk: hash in place, then link the file into the store,
+        # so a resubmission writes nothing and new bytes are never copied.
+        digest = _hash_file(source)
+        if _blob_path(digest).exists():
+            return _blob_path(digest)
+        temp_path = BLOBS_DIR / f".incoming-{uuid4().hex}"
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            shutil.copyfile(source, temp_path)
+        return _publish_blob(str(temp_path), digest)
+    if not file_obj.multiple_chunks():
+        # Small uploads are already in memory: hash first so a resubmission
+        # of known bytes never touches the disk.
+        data = b"".join(file_obj.chunks())
+        digest = hashlib.sha256(data).hexdigest()
+        if _blob_path(digest).exists():
+            return _blob_path(digest)
+        chunks: Iterable[bytes] = (data,)
+    else:
+        chunks = file_obj.chunks()
+    hasher = hashlib.sha256()
+    fd, temp_path = tempfile.mkstemp(dir=BLOBS_DIR, prefix=".incoming-")
+    try:
+        with os.fdopen(fd, "wb") as destination:
+            for chunk in chunks:
+                hasher.update(chunk)
+                destination.write(chunk)
+        return _publish_blob(temp_path, hasher.hexdigest())
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def _link_blob(blob: Path, target: Path) -> None:
+    if target.exists() and os.path.samefile(blob, target):
+        return
+    temp_target = target.with_name(f".{target.name}.{uuid4().hex}")
+    try:
+        os.link(blob, temp_target)
+    except OSError:
+        shutil.copyfile(blob, temp_target)
+    os.replace(temp_target, target)
+
+
 def save_files(candidate_id: str, category: str, files: Iterable[tuple[str, list]]) -> list[str]:
     stored_paths: list[str] = []
     base_dir = DOCUMENTS_DIR / candidate_id / "documents" / category
@@ -123,9 +848,7 @@ def save_files(candidate_id: str, category: str, files: Iterable[tuple[str, list
         for index, file_obj in enumerate(field_files, start=1):
             safe_name = Path(file_obj.name).name
             target = field_dir / f"{index}_{safe_name}"
-            with target.open("wb") as destination:
-                for chunk in file_obj.chunks():
-                    destination.write(chunk)
+            _link_blob(store_blob(file_obj), target)
             stored_paths.append(str(target))
     return stored_paths
 
@@ -0,0 +1,77 @@
+"""MongoDB mirror of the HRMS workbooks, used for dual-writes and indexed reads."""
+from __future__ import annotations
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Iterable
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+
+from core.db import get_collection
+
+
+def _filter(config, row: dict) -> dict:
+    return {field: row.get(field, "") for field in config.natural_key}
+
+
+def upsert_rows(config, rows: Iterable[dict]) -> int:
+    """Upsert ``rows`` keyed on the config's natural key; returns operations sent."""
+    operations = [UpdateOne(_filter(config, row), {"$set": dict(row)}, upsert=True) for row in rows]
+    if operations:
+        get_collection(config.collection).bulk_write(operations, ordered=False)
+    return len(operations)
+
+
+def _to_row(config, document: dict) -> dict:
+    return {header: document.get(header, "") for header in config.headers}
+
+
+def find_row(config, key_value: str) -> dict | None:
+    document = get_collection(config.collection).find_one({config.key: str(key_value)})
+    return _to_row(config, document) if document else None
+
+
+def _encode_cursor(object_id: ObjectId) -> str:
+    return urlsafe_b64encode(f"mongo:{object_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> ObjectId:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, value = urlsafe_b64decode(padded.encode()).decode().split(":", 1)
+        if prefix != "mongo":
+            raise ValueError(prefix)
+        return ObjectId(value)
+    except (ValueError, UnicodeDecodeError, InvalidId) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def query_rows(
+    config,
+    *,
+    filters: dict,
+    start: str | None = None,
+    end: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = 100,
+    descending: bool = False,
+) -> tuple[list[dict], str | None]:
+    query = dict(filters)
+    if start is not None or end is not None:
+        date_range = {}
+        if start is not None:
+            date_range["$gte"] = start
+        if end is not None:
+            date_range["$lte"] = end
+        query[config.partition_field] = date_range
+    if cursor:
+        query["_id"] = {"$lt" if descending else "$gt": _decode_cursor(cursor)}
+    documents = get_collection(config.collection).find(query).sort("_id", -1 if descending else 1)
+    if limit is not None:
+        documents = documents.limit(limit)
+    documents = list(documents)
+    next_cursor = None
+    if limit is not None and len(documents) == limit:
+        next_cursor = _encode_cursor(documents[-1]["_id"])
+    return [_to_row(config, document) for document in documents], next_cursor
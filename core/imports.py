@@ -0,0 +1,428 @@
+"""Streaming bulk import of uploaded module sheets into Mongo, run as background jobs."""
+import logging
+import re
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from uuid import uuid4
+
+from django.conf import settings
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from core.db import get_collection, get_db
+from core.excel import iter_rows_from_upload
+from core.tasks import imports as import_pool
+from finance.rollups import ROLLUP_SOURCES, record_changes, record_entries, rollup_fields
+
+logger = logging.getLogger(__name__)
+
+# GridFS bucket holding uploads until their job completes, so any process
+# running ``process_import_jobs`` can read them.
+UPLOADS_BUCKET = 'import_uploads'
+JOB_ID_PATTERN = re.compile(r'^IMP-[0-9A-F]{12}$')
+
+MODULE_COLLECTIONS = {
+    'employees': 'employees',
+    'revenue': 'revenue_entries',
+    'expenses': 'expense_entries',
+    'payroll': 'payroll_records',
+    'budgets': 'budget_entries',
+}
+# Columns identifying a row across re-imports, for ``?mode=upsert``.
+NATURAL_KEYS = {
+    'employees': ('employee_code',),
+    'payroll': ('employee_code', 'month'),
+    'budgets': ('department', 'fiscal_year'),
+}
+IMPORT_MODES = ('insert', 'upsert')
+# Column types per module; the keys (in order) are also the template headers.
+MODULE_SCHEMAS = {
+    'employees': {
+        'employee_code': 'string',
+        'full_name': 'string',
+        'official_email': 'string',
+        'personal_email': 'string',
+        'phone': 'string',
+        'department': 'string',
+        'designation': 'string',
+        'salary_ctc': 'number',
+        'salary_basic': 'number',
+        'status': 'string',
+    },
+    'revenue': {'source': 'string', 'amount': 'number', 'date': 'date', 'notes': 'string'},
+    'expenses': {'category': 'string', 'vendor': 'string', 'amount': 'number', 'date': 'date', 'notes': 'string'},
+    'payroll': {'employee_code': 'string', 'month': 'month', 'amount': 'number', 'notes': 'string'},
+    'budgets': {'department': 'string', 'amount': 'number', 'fiscal_year': 'string', 'notes': 'string'},
+}
+DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%Y/%m/%d')
+MONTH_FORMATS = ('%Y-%m', '%m/%Y', '%m-%Y', '%b %Y', '%B %Y')
+
+
+def _to_string(value):
+    if isinstance(value, float) and value.is_integer():
+        # Codes and phone numbers typed into numeric cells come back as floats.
+        value = int(value)
+    return str(value).strip()
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        raise ValueError('expected a number')
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        number = float(str(value).replace(',', '').strip())
+    except ValueError:
+        raise ValueError('expected a number') from None
+    return int(number) if number.is_integer() else number
+
+
+def _parse(value, formats, message):
+    text = str(value).strip()
+    for fmt in formats:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    raise ValueError(message)
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return _parse(value, DATE_FORMATS, 'expected a date (YYYY-MM-DD)')
+
+
+def _to_month(value):
+    if not isinstance(value, date):
+        value = _parse(value, MONTH_FORMATS, 'expected a month (YYYY-MM)')
+    return value.strftime('%Y-%m')
+
+
+COERCERS = {'string': _to_string, 'number': _to_number, 'date': _to_date, 'month': _to_month}
+
+
+def template_headers(module):
+    schema = MODULE_SCHEMAS.get(module)
+    return list(schema) if schema else None
+
+
+def _coerce_chunk(chunk, schema):
+    """Coerce a chunk column by column; rows with an invalid cell are split out as errors."""
+    problems = {}
+    for column, kind in schema.items():
+        coerce = COERCERS[kind]
+        for number, row in chunk:
+            value = row.get(column)
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '':
+                if column in row:
+                    row[column] = None
+                continue
+            try:
+                row[column] = coerce(value)
+            except ValueError as exc:
+                problems.setdefault(number, []).append(f'{column}: {exc}')
+    valid = [(number, row) for number, row in chunk if number not in problems]
+    errors = [(number, '; '.join(messages)) for number, messages in problems.items()]
+    return valid, errors
+
+
+def _numbered_chunks(rows, size):
+    """Yield lists of ``(sheet_row_number, row)``; row 1 is the header, blank rows are skipped."""
+    numbered = (
+        (number, row)
+        for number, row in enumerate(rows, start=2)
+        if any(value not in (None, '') for value in row.values())
+    )
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _insert_chunk(collection, chunk, created_at):
+    documents = [row for _, row in chunk]
+    for document in documents:
+        document['created_at'] = created_at
+    try:
+        inserted = len(collection.insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as exc:
+        write_errors = exc.details.get('writeErrors', [])
+        failed = {error['index'] for error in write_errors}
+        inserted = [document for index, document in enumerate(documents) if index not in failed]
+        record_entries(collection.name, inserted)
+        errors = [(chunk[error['index']][0], error.get('errmsg', '')) for error in write_errors]
+        return exc.details.get('nInserted', len(documents) - len(write_errors)), 0, errors
+    record_entries(collection.name, documents)
+    return inserted, 0, []
+
+
+def _stored_versions(collection, key_fields, rows):
+    """Current documents for the natural keys in ``rows``, keyed by key tuple."""
+    fields = set(key_fields) | set(rollup_fields(collection.name))
+    cursor = collection.find(
+        {'$or': [{field: row[field] for field in key_fields} for row in rows]},
+        {field: 1 for field in fields},
+    )
+    return {tuple(document.get(field) for field in key_fields): document for document in cursor}
+
+
+def _record_upserts(collection, key_fields, rows, stored, created_at):
+    removed, added = [], []
+    for row in rows:
+        key = tuple(row[field] for field in key_fields)
+        previous = stored.get(key)
+        if previous is None:
+            current = {**row, 'created_at': created_at}
+        else:
+            removed.append(previous)
+            current = {**previous, **row}
+        # A later row with the same key in this chunk overwrites this one.
+        stored[key] = current
+        added.append(current)
+    record_changes(collection.name, removed, added)
+
+
+def _upsert_chunk(collection, chunk, created_at, key_fields):
+    requests, row_numbers, rows, errors = [], [], [], []
+    for number, row in chunk:
+        missing = [field for field in key_fields if row.get(field) in (None, '')]
+        if missing:
+            errors.append((number, f"Missing key field(s): {', '.join(missing)}"))
+            continue
+        row.pop('created_at', None)
+        row['updated_at'] = created_at
+        requests.append(
+            UpdateOne(
+                {field: row[field] for field in key_fields},
+                {'$set': row, '$setOnInsert': {'created_at': created_at}},
+                upsert=True,
+            )
+        )
+        row_numbers.append(number)
+        rows.append(row)
+    if not requests:
+        return 0, 0, errors
+    # Read the versions about to be overwritten so rollups get exact deltas.
+    stored = _stored_versions(collection, key_fields, rows) if collection.name in ROLLUP_SOURCES else None
+    try:
+        result = collection.bulk_write(requests, ordered=False)
+    except BulkWriteError as exc:
+        write_errors = exc.details.get('writeErrors', [])
+        failed = {error['index'] for error in write_errors}
+        if stored is not None:
+            written = [row for index, row in enumerate(rows) if index not in failed]
+            _record_upserts(collection, key_fields, written, stored, created_at)
+        errors.extend((row_numbers[error['index']], error.get('errmsg', '')) for error in write_errors)
+        return exc.details.get('nUpserted', 0), exc.details.get('nMatched', 0), sorted(errors)
+    if stored is not None:
+        _record_upserts(collection, key_fields, rows, stored, created_at)
+    return result.upserted_count, result.matched_count, errors
+
+
+def import_rows(collection_name, rows, chunk_size=None, on_chunk=None, key_fields=None, schema=None):
+    """Write ``rows`` in fixed-size unordered chunks and report per-row failures.
+
+    Cells are first coerced to the column types in ``schema`` so documents
+    store native numbers, dates and normalised strings; rows with a cell that
+    cannot be coerced fail. Rows are inserted, or upserted on ``key_fields``
+    when given (existing documents count as ``updated``). A failing row (e.g. a duplicate
+    ``employee_code``) no longer aborts the rest of the upload. Only the
+    first ``IMPORT_MAX_REPORTED_ERRORS`` errors are listed; ``failed`` always
+    counts all of them. ``on_chunk`` is called with the running totals after
+    every chunk.
+    """
+    collection = get_collection(collection_name)
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    result = {'inserted': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    for chunk in _numbered_chunks(rows, chunk_size):
+        created_at = datetime.utcnow()
+        invalid = []
+        if schema:
+            chunk, invalid = _coerce_chunk(chunk, schema)
+        if not chunk:
+            inserted, updated, errors = 0, 0, []
+        elif key_fields:
+            inserted, updated, errors = _upsert_chunk(collection, chunk, created_at, key_fields)
+        else:
+            inserted, updated, errors = _insert_chunk(collection, chunk, created_at)
+        errors = sorted(invalid + errors)
+        result['inserted'] += inserted
+        result['updated'] += updated
+        result['failed'] += len(errors)
+        room = settings.IMPORT_MAX_REPORTED_ERRORS - len(result['errors'])
+        result['errors'].extend({'row': number, 'error': message} for number, message in errors[:max(room, 0)])
+        if on_chunk:
+            on_chunk(result)
+    return result
+
+
+def _jobs():
+    return get_collection('import_jobs')
+
+
+def _uploads():
+    return GridFSBucket(get_db(), bucket_name=UPLOADS_BUCKET)
+
+
+def _open_upload(job):
+    if 'path' in job:
+        # Queued before uploads moved from data/imports/ to GridFS.
+        return open(job['path'], 'rb')
+    return _uploads().open_download_stream(job['upload_id'])
+
+
+def _discard_upload(job):
+    if 'path' in job:
+        Path(job['path']).unlink(missing_ok=True)
+    elif job.get('upload_id') is not None:
+        try:
+            _uploads().delete(job['upload_id'])
+        except NoFile:
+            pass
+
+
+def _progress_fields(result):
+    return {
+        'rows_processed': result['inserted'] + result['updated'] + result['failed'],
+        'inserted': result['inserted'],
+        'updated': result['updated'],
+        'failed': result['failed'],
+        'errors': result['errors'],
+        'updated_at': datetime.utcnow(),
+    }
+
+
+def get_import_job(job_id):
+    if not JOB_ID_PATTERN.match(job_id):
+        return None
+    return _jobs().find_one({'_id': job_id})
+
+
+def public_job(job):
+    started_at = job.get('started_at')
+    elapsed = ((job.get('finished_at') or datetime.utcnow()) - started_at).total_seconds() if started_at else 0
+    return {
+        'job_id': job['_id'],
+        'module': job['module'],
+        'mode': job.get('mode', 'insert'),
+        'status': job['status'],
+        'rows_processed': job['rows_processed'],
+        'inserted': job['inserted'],
+        'updated': job.get('updated', 0),
+        'failed': job['failed'],
+        'errors': job['errors'],
+        'error': job.get('error'),
+        'rows_per_second': round(job['rows_processed'] / elapsed, 1) if elapsed > 0 else None,
+        'created_at': job['created_at'],
+        'started_at': started_at,
+        'finished_at': job.get('finished_at'),
+    }
+
+
+def run_import_job(job_id):
+    """Claim a queued job and import its stored upload; returns False if it was already claimed."""
+    now = datetime.utcnow()
+    job = _jobs().find_one_and_update(
+        {'_id': job_id, 'status': 'queued'},
+        {'$set': {'status': 'processing', 'started_at': now, 'updated_at': now}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if job is None:
+        return False
+
+    def record_progress(result):
+        _jobs().update_one({'_id': job_id}, {'$set': _progress_fields(result)})
+
+    try:
+        with _open_upload(job) as handle:
+            result = import_rows(
+                job['collection'],
+                iter_rows_from_upload(handle),
+                on_chunk=record_progress,
+                key_fields=NATURAL_KEYS[job['module']] if job.get('mode') == 'upsert' else None,
+                schema=MODULE_SCHEMAS[job['module']],
+            )
+    except Exception as exc:
+        logger.exception('Import job %s failed: %s', job_id, exc)
+        _jobs().update_one(
+            {'_id': job_id},
+            {'$set': {'status': 'failed', 'error': str(exc), 'finished_at': datetime.utcnow()}},
+        )
+        _discard_upload(job)
+        return True
+    fields = _progress_fields(result)
+    fields.update(status='completed', finished_at=fields['updated_at'])
+    _jobs().update_one({'_id': job_id}, {'$set': fields})
+    _discard_upload(job)
+    return True
+
+
+def create_import_job(module, file_obj, mode='insert', created_by=None):
+    """Store the upload in GridFS, record a queued job and hand it to the import pool.
+
+    The import pool is separate from ``core.tasks.submit``'s, so large
+    imports never delay onboarding or auth refreshes. When it is saturated
+    the job stays queued until the ``process_import_jobs`` worker picks it up.
+    """
+    job_id = f'IMP-{uuid4().hex[:12].upper()}'
+    upload_id = _uploads().upload_from_stream(f'{job_id}.xlsx', file_obj)
+    now = datetime.utcnow()
+    job = {
+        '_id': job_id,
+        'module': module,
+        'collection': MODULE_COLLECTIONS[module],
+        'mode': mode,
+        'upload_id': upload_id,
+        'status': 'queued',
+        'rows_processed': 0,
+        'inserted': 0,
+        'updated': 0,
+        'failed': 0,
+        'errors': [],
+        'created_by': created_by,
+        'created_at': now,
+        'updated_at': now,
+    }
+    _jobs().insert_one(job)
+    import_pool.submit(run_import_job, job_id)
+    return job
+
+
+def queued_job_ids():
+    return [job['_id'] for job in _jobs().find({'status': 'queued'}, {'_id': 1}).sort('created_at', 1)]
+
+
+def reclaim_stale_jobs(older_than):
+    """Release ``processing`` jobs with no progress since ``older_than`` (e.g. a worker died).
+
+    Upsert jobs are idempotent and go back to ``queued``; insert jobs would
+    duplicate the rows already written, so they are marked ``failed``.
+    Returns ``(job_id, status)`` pairs.
+    """
+    reclaimed = []
+    stale = {'status': 'processing', 'updated_at': {'$lt': older_than}}
+    for job in _jobs().find(stale, {'mode': 1, 'rows_processed': 1, 'upload_id': 1, 'path': 1}).sort('created_at', 1):
+        now = datetime.utcnow()
+        if job.get('mode') == 'upsert':
+            update = {'status': 'queued', 'updated_at': now}
+        else:
+            update = {
+                'status': 'failed',
+                'error': f"Worker stopped after {job.get('rows_processed', 0)} rows; re-upload the remaining rows.",
+                'updated_at': now,
+                'finished_at': now,
+            }
+        if _jobs().update_one({'_id': job['_id'], **stale}, {'$set': update}).modified_count:
+            if update['status'] == 'failed':
+                _discard_upload(job)
+            reclaimed.append((job['_id'], update['status']))
+    return reclaimed
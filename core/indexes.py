@@ -0,0 +1,38 @@
+from pymongo import ASCENDING
+
+from core.indexing import Index, QueryShape
+
+INDEXES = [
+    Index('hrms_candidates', (('candidate_id', ASCENDING),), unique=True),
+    Index('hrms_candidates', (('selection_status', ASCENDING), ('_id', ASCENDING))),
+    Index('hrms_candidates', (('position_applied_for', ASCENDING), ('_id', ASCENDING))),
+    Index('hrms_candidates', (('final_status', ASCENDING), ('_id', ASCENDING))),
+    Index('hrms_onboarding', (('candidate_id', ASCENDING), ('submitted_at', ASCENDING)), unique=True),
+    Index('hrms_attendance', (('attendance_id', ASCENDING),), unique=True),
+    Index('hrms_attendance', (('candidate_id', ASCENDING), ('_id', ASCENDING))),
+    Index('hrms_attendance', (('status', ASCENDING), ('_id', ASCENDING))),
+    Index('hrms_attendance', (('attendance_date', ASCENDING),)),
+    Index('import_jobs', (('status', ASCENDING), ('created_at', ASCENDING))),
+]
+
+QUERIES = [
+    QueryShape('hrms_candidates', {'candidate_id': 'CAND-0001'}, source='core.hrms_mongo.find_row'),
+    QueryShape(
+        'hrms_candidates', {'selection_status': 'SELECTED'}, (('_id', ASCENDING),), 'CandidateListCreateView.get'
+    ),
+    QueryShape(
+        'hrms_candidates', {'position_applied_for': 'Driver'}, (('_id', ASCENDING),), 'CandidateListCreateView.get'
+    ),
+    QueryShape('hrms_candidates', {'final_status': 'JOINED'}, (('_id', ASCENDING),), 'CandidateListCreateView.get'),
+    QueryShape(
+        'hrms_attendance', {'candidate_id': 'CAND-0001'}, (('_id', ASCENDING),), 'AttendanceListCreateView.get'
+    ),
+    QueryShape('hrms_attendance', {'status': 'PRESENT'}, (('_id', ASCENDING),), 'AttendanceListCreateView.get'),
+    QueryShape(
+        'hrms_attendance',
+        {'attendance_date': {'$gte': '2024-01-01', '$lte': '2024-01-31'}},
+        (('_id', ASCENDING),),
+        'AttendanceListCreateView.get',
+    ),
+    QueryShape('import_jobs', {'status': 'queued'}, (('created_at', ASCENDING),), 'core.imports.queued_job_ids'),
+]
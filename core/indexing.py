@@ -0,0 +1,58 @@
+"""Declarative MongoDB index registry.
+
+Each installed app may ship an ``indexes.py`` with ``INDEXES`` (what to
+build) and ``QUERIES`` (the filter/sort shapes its views issue). Indexes
+are built by ``core.db.ensure_indexes``; ``manage.py index_advisor``
+explains every query shape and flags collection scans.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+
+from django.apps import apps
+from django.utils.module_loading import module_has_submodule
+
+
+@dataclass(frozen=True)
+class Index:
+    collection: str
+    keys: tuple[tuple[str, int], ...]
+    unique: bool = False
+    partial: dict | None = None
+    name: str | None = None
+    expire_after: int | None = None
+
+    def options(self) -> dict:
+        options = {}
+        if self.unique:
+            options['unique'] = True
+        if self.partial:
+            options['partialFilterExpression'] = self.partial
+        if self.name:
+            options['name'] = self.name
+        if self.expire_after is not None:
+            options['expireAfterSeconds'] = self.expire_after
+        return options
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    collection: str
+    filter: dict
+    sort: tuple[tuple[str, int], ...] = ()
+    source: str = ''
+
+
+def _app_modules():
+    for app_config in apps.get_app_configs():
+        if module_has_submodule(app_config.module, 'indexes'):
+            yield import_module(f'{app_config.name}.indexes')
+
+
+def registered_indexes() -> list[Index]:
+    return [index for module in _app_modules() for index in getattr(module, 'INDEXES', ())]
+
+
+def registered_queries() -> list[QueryShape]:
+    return [query for module in _app_modules() for query in getattr(module, 'QUERIES', ())]
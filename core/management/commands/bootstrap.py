@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.bootstrap import run_bootstrap
+
+
+class Command(BaseCommand):
+    help = 'Check MongoDB, build registered indexes and seed the superuser. Run once per deploy.'
+
+    def handle(self, *args, **options):
+        elapsed = run_bootstrap()
+        self.stdout.write(self.style.SUCCESS(f'Bootstrap completed in {elapsed:.2f}s.'))
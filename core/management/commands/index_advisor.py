@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db import ensure_indexes, get_db
+from core.indexing import registered_queries
+
+
+def _stages(plan):
+    if not plan:
+        return
+    yield plan.get('stage')
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get('inputStages', ()):
+        yield from _stages(child)
+
+
+class Command(BaseCommand):
+    help = 'Explain every registered query shape and flag the ones that scan a whole collection.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ensure', action='store_true', help='Build the registered indexes first.')
+        parser.add_argument('--strict', action='store_true', help='Exit with an error if any COLLSCAN is found.')
+
+    def handle(self, *args, **options):
+        if options['ensure']:
+            ensure_indexes()
+        db = get_db()
+        scans = 0
+        queries = registered_queries()
+        for query in queries:
+            cursor = db[query.collection].find(query.filter)
+            if query.sort:
+                cursor = cursor.sort(list(query.sort))
+            plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+            stages = [stage for stage in _stages(plan) if stage]
+            label = f'{query.collection} {query.filter}'
+            if query.sort:
+                label += f' sort {dict(query.sort)}'
+            if query.source:
+                label += f' [{query.source}]'
+            if 'COLLSCAN' in stages:
+                scans += 1
+                self.stdout.write(self.style.WARNING(f'COLLSCAN  {label}'))
+            else:
+                self.stdout.write(f"{' > '.join(stages) or 'EOF'}  {label}")
+        if scans and options['strict']:
+            raise CommandError(f'{scans} of {len(queries)} query shapes scan a whole collection.')
+        self.stdout.write(self.style.SUCCESS(f'{len(queries)} query shapes checked, {scans} collection scans.'))
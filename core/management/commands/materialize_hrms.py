@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.hrms import ATTENDANCE_FILE, CANDIDATES_FILE, ONBOARDING_FILE, materialize, seal_expired_partitions
+
+
+class Command(BaseCommand):
+    help = 'Fold journaled HRMS rows into the candidates/onboarding/attendance workbooks.'
+
+    def handle(self, *args, **options):
+        for name, config in (
+            ('candidates', CANDIDATES_FILE),
+            ('onboarding', ONBOARDING_FILE),
+            ('attendance', ATTENDANCE_FILE),
+        ):
+            folded = materialize(config)
+            self.stdout.write(f'{name}: {folded} rows materialized.')
+        for month in seal_expired_partitions(ATTENDANCE_FILE):
+            self.stdout.write(f'attendance {month}: sealed.')
+        self.stdout.write(self.style.SUCCESS('HRMS workbooks materialized.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.hrms import ATTENDANCE_FILE, CANDIDATES_FILE, ONBOARDING_FILE, iter_rows
+from core.hrms_mongo import upsert_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk-load the HRMS workbooks into MongoDB, upserting on each natural key.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for config in (CANDIDATES_FILE, ONBOARDING_FILE, ATTENDANCE_FILE):
+            loaded = 0
+            batch = []
+            for row in iter_rows(config):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    loaded += upsert_rows(config, batch)
+                    batch = []
+            loaded += upsert_rows(config, batch)
+            self.stdout.write(f'{config.collection}: {loaded} rows upserted.')
+        self.stdout.write(self.style.SUCCESS('HRMS data migrated to MongoDB.'))
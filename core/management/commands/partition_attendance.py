@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.hrms import ATTENDANCE_FILE, LEGACY_ATTENDANCE_FILE, append_rows, iter_rows, materialize
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Split the legacy attendance.xlsx into monthly attendance partitions.'
+
+    def handle(self, *args, **options):
+        legacy = LEGACY_ATTENDANCE_FILE
+        if not (legacy.path.exists() or legacy.journal_path.exists() or legacy.segment_paths()):
+            self.stdout.write('No legacy attendance workbook found.')
+            return
+        materialize(legacy)
+        moved = 0
+        batch = []
+        for row in iter_rows(legacy):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                append_rows(ATTENDANCE_FILE, batch)
+                moved += len(batch)
+                batch = []
+        if batch:
+            append_rows(ATTENDANCE_FILE, batch)
+            moved += len(batch)
+        archived = legacy.path.with_name('attendance.pre-partition.xlsx')
+        legacy.path.rename(archived)
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} rows into monthly partitions; legacy file kept as {archived.name}.'))
@@ -0,0 +1,35 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.imports import queued_job_ids, reclaim_stale_jobs, run_import_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Run queued module import jobs (those the in-process pool had no room for) '
+        'and reclaim jobs left processing by a worker that exited.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help='Keep polling for new jobs.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --watch.')
+        parser.add_argument(
+            '--older-than', type=int, default=15, help='Minutes without progress before a processing job is reclaimed.'
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            cutoff = datetime.utcnow() - timedelta(minutes=options['older_than'])
+            for job_id, status in reclaim_stale_jobs(cutoff):
+                self.stdout.write(f'{job_id}: stale, {status}.')
+            for job_id in queued_job_ids():
+                if run_import_job(job_id):
+                    processed += 1
+                    self.stdout.write(f'{job_id}: done.')
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'{processed} import jobs processed.'))
@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.onboarding import persist_submission, stale_submissions
+
+
+class Command(BaseCommand):
+    help = 'Persist onboarding submissions left pending by a worker that exited before finishing them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=15, help='Minutes a submission must be pending.')
+
+    def handle(self, *args, **options):
+        cutoff = datetime.utcnow() - timedelta(minutes=options['older_than'])
+        submission_ids = stale_submissions(cutoff)
+        for submission_id in submission_ids:
+            persist_submission(submission_id)
+            self.stdout.write(f'{submission_id}: replayed.')
+        self.stdout.write(self.style.SUCCESS(f'{len(submission_ids)} pending submissions processed.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.attendance_rollup import rebuild_sealed_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recount the persisted attendance summaries of every sealed month.'
+
+    def handle(self, *args, **options):
+        months = rebuild_sealed_summaries()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt attendance summaries for {len(months)} sealed months.'))
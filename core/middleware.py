@@ -1,8 +1,12 @@
+import json
 import logging
+import time
 import uuid
 
 from django.http import JsonResponse
 
+from core.mongo_metrics import end_request, resume_request, start_request
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +22,73 @@ class RequestIDMiddleware:
         return response
 
 
+class MongoTimingMiddleware:
+    """Attribute Mongo commands to the request and report them as ``Server-Timing``.
+
+    Streamed responses (exports) run their queries after the view returns, so
+    their commands are counted while the body is consumed and only logged;
+    the header then carries just the time to the first byte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        stats, token = start_request(getattr(request, 'request_id', None))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        total_ms = (time.perf_counter() - started) * 1000
+        if response.streaming and not getattr(response, 'is_async', False):
+            response['Server-Timing'] = f'app;dur={total_ms:.1f}'
+            content = response.streaming_content
+            response.streaming_content = self._timed_stream(request, response, stats, started, content)
+            return response
+        timings = [f'app;dur={total_ms:.1f}', f'db;dur={stats.total_ms:.1f};desc="{stats.commands} commands"']
+        if stats.slowest_command:
+            timings.append(f'db-slowest;dur={stats.slowest_ms:.1f};desc="{stats.slowest_command}"')
+        response['Server-Timing'] = ', '.join(timings)
+        self._log(request, response, stats, total_ms)
+        return response
+
+    def _timed_stream(self, request, response, stats, started, content):
+        chunks = iter(content)
+        try:
+            while True:
+                token = resume_request(stats)
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    return
+                finally:
+                    end_request(token)
+                yield chunk
+        finally:
+            self._log(request, response, stats, (time.perf_counter() - started) * 1000)
+
+    def _log(self, request, response, stats, total_ms):
+        if not stats.commands:
+            return
+        logger.info(
+            'mongo.request %s',
+            json.dumps(
+                {
+                    'request_id': stats.request_id,
+                    'method': request.method,
+                    'path': request.path,
+                    'status': response.status_code,
+                    'duration_ms': round(total_ms, 2),
+                    'db_commands': stats.commands,
+                    'db_ms': round(stats.total_ms, 2),
+                    'db_slowest_ms': round(stats.slowest_ms, 2),
+                    'db_slowest_command': stats.slowest_command,
+                }
+            ),
+        )
+
+
 class ErrorHandlingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
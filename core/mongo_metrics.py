@@ -0,0 +1,100 @@
+"""Per-request MongoDB command timing via a pymongo ``CommandListener``."""
+import json
+import logging
+from contextvars import ContextVar
+
+from django.conf import settings
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+_IGNORED_KEYS = {'lsid', '$db', '$clusterTime', '$readPreference', 'txnNumber', 'apiVersion'}
+
+_current = ContextVar('mongo_request_stats', default=None)
+
+
+class RequestStats:
+    __slots__ = ('request_id', 'commands', 'total_ms', 'slowest_ms', 'slowest_command')
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.commands = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_command = None
+
+    def record(self, command_name, duration_ms):
+        self.commands += 1
+        self.total_ms += duration_ms
+        if duration_ms >= self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_command = command_name
+
+
+def start_request(request_id):
+    stats = RequestStats(request_id)
+    return stats, resume_request(stats)
+
+
+def resume_request(stats):
+    """Attribute commands to ``stats`` again, e.g. while a streamed body is produced."""
+    return _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def command_shape(value, top=True):
+    """Strip literal values from a command so it can be logged (``{'find': 'users', 'filter': {'email': '?'}}``)."""
+    if isinstance(value, dict):
+        shape = {}
+        for index, (key, item) in enumerate(value.items()):
+            if key in _IGNORED_KEYS:
+                continue
+            # The first key of a command names its collection; keep it verbatim.
+            shape[key] = item if top and index == 0 else command_shape(item, top=False)
+        return shape
+    if isinstance(value, (list, tuple)):
+        return [command_shape(value[0], top=False)] if value else []
+    return '?'
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        self._pending[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        started = self._pending.pop((event.connection_id, event.request_id), None)
+        duration_ms = event.duration_micros / 1000
+        stats = _current.get()
+        if stats is not None:
+            stats.record(event.command_name, duration_ms)
+        if started and duration_ms >= settings.MONGO_SLOW_COMMAND_MS:
+            database, command = started
+            logger.warning(
+                'mongo.slow_command %s',
+                json.dumps(
+                    {
+                        'request_id': stats.request_id if stats else None,
+                        'command': event.command_name,
+                        'database': database,
+                        'duration_ms': round(duration_ms, 2),
+                        'shape': command_shape(command),
+                    },
+                    default=str,
+                ),
+            )
+
+
+command_listener = CommandTimingListener()
+
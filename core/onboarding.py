@@ -0,0 +1,159 @@
+"""Spooled onboarding submissions persisted off the request thread."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+from django.core.files import File
+
+from core.hrms import DATA_DIR, ONBOARDING_FILE, append_row, filter_rows, save_files
+from core.tasks import submit
+
+logger = logging.getLogger(__name__)
+
+SPOOL_DIR = DATA_DIR / "spool"
+SUBMISSIONS_DIR = DATA_DIR / "submissions"
+SUBMISSION_ID_PATTERN = re.compile(r"^SUB-[0-9A-F]{12}$")
+PENDING_STATUSES = ("queued", "processing")
+
+
+def _status_path(submission_id: str) -> Path:
+    return SUBMISSIONS_DIR / f"{submission_id}.json"
+
+
+def read_status(submission_id: str) -> dict | None:
+    if not SUBMISSION_ID_PATTERN.match(submission_id):
+        return None
+    try:
+        with _status_path(submission_id).open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def _write_status(submission_id: str, *, drop: tuple[str, ...] = (), **fields) -> dict:
+    record = read_status(submission_id) or {"submission_id": submission_id}
+    for field in drop:
+        record.pop(field, None)
+    record.update(fields, updated_at=datetime.utcnow().isoformat())
+    SUBMISSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    temp_path = SUBMISSIONS_DIR / f".{submission_id}.json.tmp"
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(record, handle)
+    os.replace(temp_path, _status_path(submission_id))
+    return record
+
+
+def public_status(record: dict) -> dict:
+    return {
+        field: record.get(field)
+        for field in ("submission_id", "candidate_id", "status", "error", "created_at", "completed_at")
+    }
+
+
+def _link_upload(file_obj, target: Path) -> bool:
+    # Large uploads are already spooled to disk by Django; link instead of copying.
+    if not hasattr(file_obj, "temporary_file_path"):
+        return False
+    try:
+        os.link(file_obj.temporary_file_path(), target)
+    except OSError:
+        return False
+    return True
+
+
+def _spool_files(submission_id: str, file_payload: list[tuple[str, list]]) -> list[dict]:
+    spool_dir = SPOOL_DIR / submission_id
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for field_name, field_files in file_payload:
+        for file_obj in field_files:
+            target = spool_dir / f"{len(manifest)}"
+            if not _link_upload(file_obj, target):
+                with target.open("wb") as destination:
+                    for chunk in file_obj.chunks():
+                        destination.write(chunk)
+            manifest.append({"field": field_name, "name": Path(file_obj.name).name, "path": str(target)})
+    return manifest
+
+
+def _row_appended(row: dict) -> bool:
+    return any(
+        existing.get("submitted_at") == row["submitted_at"]
+        for existing in filter_rows(ONBOARDING_FILE, "candidate_id", row["candidate_id"])
+    )
+
+
+def persist_submission(submission_id: str) -> None:
+    record = _write_status(submission_id, status="processing")
+    # A replay after a crash between the append and "completed" finds the
+    # documents and row already stored (and the spool possibly gone), so it
+    # must not log the onboarding row twice.
+    if not (record.get("appending") and _row_appended(record["row"])):
+        handles = []
+        try:
+            payload: dict[str, list[File]] = {}
+            for entry in record["files"]:
+                handle = open(entry["path"], "rb")
+                handles.append(handle)
+                payload.setdefault(entry["field"], []).append(File(handle, name=entry["name"]))
+            save_files(record["candidate_id"], record["category"], list(payload.items()))
+            _write_status(submission_id, appending=True)
+            append_row(ONBOARDING_FILE, record["row"])
+        except Exception as exc:
+            logger.exception("Onboarding submission %s failed: %s", submission_id, exc)
+            _write_status(submission_id, status="failed", error=str(exc))
+            return
+        finally:
+            for handle in handles:
+                handle.close()
+    shutil.rmtree(SPOOL_DIR / submission_id, ignore_errors=True)
+    # The row and spool manifest are only needed to replay; keep status files small.
+    _write_status(
+        submission_id,
+        drop=("row", "files", "appending"),
+        status="completed",
+        completed_at=datetime.utcnow().isoformat(),
+    )
+
+
+def submit_onboarding(candidate_id: str, category: str, file_payload: list, row: dict) -> dict:
+    """Spool the uploads and persist them on the background pool.
+
+    When the pool is saturated the submission is persisted inline so the
+    queue stays bounded.
+    """
+    submission_id = f"SUB-{uuid4().hex[:12].upper()}"
+    manifest = _spool_files(submission_id, file_payload)
+    _write_status(
+        submission_id,
+        candidate_id=candidate_id,
+        category=category,
+        status="queued",
+        row=row,
+        files=manifest,
+        created_at=datetime.utcnow().isoformat(),
+    )
+    if not submit(persist_submission, submission_id):
+        persist_submission(submission_id)
+    return public_status(read_status(submission_id))
+
+
+def stale_submissions(older_than: datetime) -> list[str]:
+    """Ids of submissions still pending since before ``older_than`` (e.g. a worker died)."""
+    if not SUBMISSIONS_DIR.exists():
+        return []
+    stale = []
+    for path in sorted(SUBMISSIONS_DIR.glob("SUB-*.json")):
+        record = read_status(path.stem)
+        if not record or record.get("status") not in PENDING_STATUSES:
+            continue
+        if datetime.fromisoformat(record["updated_at"]) < older_than:
+            stale.append(path.stem)
+    return stale
@@ -17,6 +17,8 @@ const attendanceTable = document.getElementById("attendance-table");
 const candidatesTable = document.getElementById("candidates-table");
 const refreshTableBtn = document.getElementById("refresh-table");
 const refreshAttendanceBtn = document.getElementById("refresh-attendance");
+const moreCandidatesBtn = document.getElementById("more-candidates");
+const moreAttendanceBtn = document.getElementById("more-attendance");
 
 const interviewScheduledInputs = document.querySelectorAll("input[name='interview_scheduled']");
 const interviewDateInput = document.querySelector("input[name='interview_date']");
@@ -135,9 +137,11 @@ const validateOnboardingForm = () => {
   return "";
 };
 
-const renderCandidates = (rows) => {
-  candidatesTable.innerHTML = "";
-  if (!rows.length) {
+const renderCandidates = (rows, append = false) => {
+  if (!append) {
+    candidatesTable.innerHTML = "";
+  }
+  if (!rows.length && !append) {
     const emptyRow = document.createElement("tr");
     emptyRow.innerHTML = "<td colspan='9'>No candidates saved yet.</td>";
     candidatesTable.appendChild(emptyRow);
@@ -167,9 +171,11 @@ const renderCandidates = (rows) => {
   });
 };
 
-const renderAttendance = (rows) => {
-  attendanceTable.innerHTML = "";
-  if (!rows.length) {
+const renderAttendance = (rows, append = false) => {
+  if (!append) {
+    attendanceTable.innerHTML = "";
+  }
+  if (!rows.length && !append) {
     const emptyRow = document.createElement("tr");
     emptyRow.innerHTML = "<td colspan='8'>No attendance records yet.</td>";
     attendanceTable.appendChild(emptyRow);
@@ -191,16 +197,28 @@ const renderAttendance = (rows) => {
   });
 };
 
-const loadCandidates = async () => {
-  const response = await fetch(`${apiBase}/candidates`);
+// next_cursor of the last page loaded into each table; null once exhausted.
+const nextCursors = { candidates: null, attendance: null };
+
+const fetchPage = async (resource, append) => {
+  const params = new URLSearchParams({ order: "desc" });
+  if (append && nextCursors[resource]) {
+    params.set("cursor", nextCursors[resource]);
+  }
+  const response = await fetch(`${apiBase}/${resource}?${params}`);
   const data = await response.json();
-  renderCandidates(data.candidates || []);
+  nextCursors[resource] = data.next_cursor || null;
+  return data[resource] || [];
 };
 
-const loadAttendance = async () => {
-  const response = await fetch(`${apiBase}/attendance`);
-  const data = await response.json();
-  renderAttendance(data.attendance || []);
+const loadCandidates = async (append = false) => {
+  renderCandidates(await fetchPage("candidates", append), append);
+  moreCandidatesBtn.hidden = !nextCursors.candidates;
+};
+
+const loadAttendance = async (append = false) => {
+  renderAttendance(await fetchPage("attendance", append), append);
+  moreAttendanceBtn.hidden = !nextCursors.attendance;
 };
 
 const validateAttendanceForm = () => {
@@ -263,6 +281,28 @@ candidateForm.addEventListener("submit", async (event) => {
   }
 });
 
+const ONBOARDING_POLL_MS = 1000;
+const ONBOARDING_POLL_ATTEMPTS = 60;
+
+// Poll the 202's submission until the background worker finishes it; null on timeout.
+const waitForSubmission = async (submissionId) => {
+  for (let attempt = 0; attempt < ONBOARDING_POLL_ATTEMPTS; attempt += 1) {
+    await new Promise((resolve) => setTimeout(resolve, ONBOARDING_POLL_MS));
+    try {
+      const response = await fetch(`${apiBase}/onboarding/${encodeURIComponent(submissionId)}`);
+      if (response.ok) {
+        const submission = await response.json();
+        if (submission.status === "completed" || submission.status === "failed") {
+          return submission;
+        }
+      }
+    } catch (error) {
+      // Keep polling through transient network errors.
+    }
+  }
+  return null;
+};
+
 onboardingForm.addEventListener("reset", () => {
   onboardingResult.textContent = "";
 });
@@ -284,9 +324,17 @@ onboardingForm.addEventListener("submit", async (event) => {
     showResult(onboardingResult, data.error || "Onboarding failed.", true);
     return;
   }
-  showResult(onboardingResult, "Onboarding submitted successfully.");
   onboardingForm.reset();
   updateCategorySections();
+  showResult(onboardingResult, "Onboarding queued. Storing documents...");
+  const submission = await waitForSubmission(data.submission_id);
+  if (!submission) {
+    showResult(onboardingResult, `Onboarding is still processing. Submission ID: ${data.submission_id}`);
+  } else if (submission.status === "failed") {
+    showResult(onboardingResult, submission.error || "Onboarding failed.", true);
+  } else {
+    showResult(onboardingResult, "Onboarding submitted successfully.");
+  }
 });
 
 attendanceForm.addEventListener("reset", () => {
@@ -335,8 +383,10 @@ candidatesTable.addEventListener("click", (event) => {
   }
 });
 
-refreshTableBtn.addEventListener("click", loadCandidates);
-refreshAttendanceBtn.addEventListener("click", loadAttendance);
+refreshTableBtn.addEventListener("click", () => loadCandidates());
+refreshAttendanceBtn.addEventListener("click", () => loadAttendance());
+moreCandidatesBtn.addEventListener("click", () => loadCandidates(true));
+moreAttendanceBtn.addEventListener("click", () => loadAttendance(true));
 
 updateInterviewDateState();
 updateJoiningDateState();
@@ -0,0 +1,62 @@
+"""Bounded in-process thread pools for work that should not hold up a request."""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedPool:
+    """A thread pool whose queue is capped at ``<prefix>_QUEUE_SIZE`` tasks.
+
+    The pool is created lazily so each gunicorn worker gets its own threads
+    after fork; ``<prefix>_WORKERS`` and ``<prefix>_QUEUE_SIZE`` are read
+    from settings at that point.
+    """
+
+    def __init__(self, name, setting_prefix):
+        self.name = name
+        self.setting_prefix = setting_prefix
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """Run ``fn`` on the pool; returns False when the queue is full."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, f'{self.setting_prefix}_WORKERS'),
+                    thread_name_prefix=self.name,
+                )
+                self._slots = threading.BoundedSemaphore(getattr(settings, f'{self.setting_prefix}_QUEUE_SIZE'))
+        if not self._slots.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                fn(*args, **kwargs)
+            except Exception as exc:
+                logger.exception('Background task %s failed: %s', getattr(fn, '__name__', fn), exc)
+            finally:
+                self._slots.release()
+
+        self._executor.submit(run)
+        return True
+
+
+# Short tasks: onboarding persistence, journal folds, denylist and readiness refreshes.
+background = BoundedPool('background', 'BACKGROUND')
+# Long-running module imports, kept apart so they cannot starve the pool above.
+imports = BoundedPool('import', 'IMPORT')
+
+
+def submit(fn, *args, **kwargs):
+    """Run ``fn`` on the shared background pool; returns False when the queue is full.
+
+    Callers should fall back to running the work inline when ``False`` is
+    returned.
+    """
+    return background.submit(fn, *args, **kwargs)
@@ -3,6 +3,7 @@ from datetime import datetime
 from pathlib import Path
 from uuid import uuid4
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.core.exceptions import ValidationError
@@ -13,23 +14,75 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-from core.db import get_collection
-from core.excel import workbook_from_rows, excel_response, load_rows_from_upload
+from core.bootstrap import mongo_readiness
+from core.excel import template_response
 from core.hrms import (
     ATTENDANCE_FILE,
+    ATTENDANCE_HEADERS,
+    CANDIDATE_HEADERS,
     CANDIDATES_FILE,
-    ONBOARDING_FILE,
+    ONBOARDING_HEADERS,
+    PartitionSealed,
     append_row,
     build_attendance_row,
     build_onboarding_row,
     candidate_exists,
     create_candidate_id,
-    load_rows,
-    save_files,
+    date_key,
+    partition_month,
+    query_rows,
 )
+from core.attendance_rollup import monthly_summary
+from core.imports import (
+    IMPORT_MODES,
+    MODULE_COLLECTIONS,
+    NATURAL_KEYS,
+    create_import_job,
+    get_import_job,
+    public_job,
+    template_headers,
+)
+from core.onboarding import public_status, read_status, submit_onboarding
 from accounts.permissions import MakerOnly
 
 
+HRMS_TEMPLATE_HEADERS = {
+    'candidates': CANDIDATE_HEADERS,
+    'onboarding': ONBOARDING_HEADERS,
+    'attendance': ATTENDANCE_HEADERS,
+}
+
+
+def _hrms_page(request, config, result_key, filter_fields, **date_range):
+    params = request.query_params
+    try:
+        limit = int(params.get('limit', settings.HRMS_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'limit must be positive.'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, settings.HRMS_MAX_PAGE_SIZE)
+    fields = [field.strip() for field in params.get('fields', '').split(',') if field.strip()]
+    unknown = [field for field in fields if field not in config.headers]
+    if unknown:
+        return Response({'error': f"Unknown fields: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+    filters = {field: params[field] for field in filter_fields if params.get(field)}
+    try:
+        rows, next_cursor = query_rows(
+            config,
+            filters=filters,
+            cursor=params.get('cursor'),
+            limit=limit,
+            descending=params.get('order') == 'desc',
+            **date_range,
+        )
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    if fields:
+        rows = [{field: row.get(field, '') for field in fields} for row in rows]
+    return Response({result_key: rows, 'next_cursor': next_cursor})
+
+
 def root_view(request):
     accept_header = request.headers.get('accept', '')
     if 'text/html' in accept_header:
@@ -38,28 +91,19 @@ def root_view(request):
 
 
 def health_view(request):
-    return JsonResponse({'status': 'healthy'})
+    ready = mongo_readiness()
+    mongo = 'unknown' if ready is None else ('ok' if ready else 'unreachable')
+    return JsonResponse({'status': 'healthy', 'mongo': mongo})
 
 
 class TemplateDownloadView(APIView):
     permission_classes = [MakerOnly]
 
     def get(self, request, module):
-        templates = {
-            'employees': [
-                'employee_code', 'full_name', 'official_email', 'personal_email', 'phone',
-                'department', 'designation', 'salary_ctc', 'salary_basic', 'status',
-            ],
-            'revenue': ['source', 'amount', 'date', 'notes'],
-            'expenses': ['category', 'vendor', 'amount', 'date', 'notes'],
-            'payroll': ['employee_code', 'month', 'amount', 'notes'],
-            'budgets': ['department', 'amount', 'fiscal_year', 'notes'],
-        }
-        headers = templates.get(module)
+        headers = template_headers(module) or HRMS_TEMPLATE_HEADERS.get(module)
         if not headers:
             return Response({'error': 'Unknown module'}, status=status.HTTP_400_BAD_REQUEST)
-        workbook = workbook_from_rows([dict.fromkeys(headers, '')])
-        return excel_response(workbook, f'{module}_template.xlsx')
+        return template_response(request, headers, f'{module}_template.xlsx')
 
 
 class ImportModuleView(APIView):
@@ -69,30 +113,37 @@ class ImportModuleView(APIView):
         file_obj = request.FILES.get('file')
         if not file_obj:
             return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
-        rows = load_rows_from_upload(file_obj)
-        collection_map = {
-            'employees': 'employees',
-            'revenue': 'revenue_entries',
-            'expenses': 'expense_entries',
-            'payroll': 'payroll_records',
-            'budgets': 'budget_entries',
-        }
-        collection_name = collection_map.get(module)
-        if not collection_name:
+        if module not in MODULE_COLLECTIONS:
             return Response({'error': 'Unknown module'}, status=status.HTTP_400_BAD_REQUEST)
-        collection = get_collection(collection_name)
-        for row in rows:
-            row['created_at'] = datetime.utcnow()
-        if rows:
-            collection.insert_many(rows)
-        return Response({'inserted': len(rows)})
+        mode = request.query_params.get('mode', 'insert')
+        if mode not in IMPORT_MODES:
+            return Response({'error': f"mode must be one of: {', '.join(IMPORT_MODES)}"}, status=status.HTTP_400_BAD_REQUEST)
+        if mode == 'upsert' and module not in NATURAL_KEYS:
+            return Response({'error': f'Upsert is not supported for {module}.'}, status=status.HTTP_400_BAD_REQUEST)
+        job = create_import_job(module, file_obj, mode=mode, created_by=getattr(request.user, 'email', None))
+        return Response(public_job(job), status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobView(APIView):
+    permission_classes = [MakerOnly]
+
+    def get(self, request, job_id):
+        job = get_import_job(job_id)
+        if not job:
+            return Response({'error': 'Import job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(public_job(job))
 
 
 class CandidateListCreateView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        return Response({'candidates': load_rows(CANDIDATES_FILE)})
+        return _hrms_page(
+            request,
+            CANDIDATES_FILE,
+            'candidates',
+            ('selection_status', 'position_applied_for', 'final_status'),
+        )
 
     def post(self, request):
         required_fields = [
@@ -315,8 +366,6 @@ class OnboardingCreateView(APIView):
         if not str(data.get('final_notes', '')).strip():
             return Response({'error': 'Final onboarding status is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        save_files(candidate_id, category, file_payload)
-
         row = build_onboarding_row(
             candidate_id=candidate_id,
             category=category,
@@ -327,19 +376,32 @@ class OnboardingCreateView(APIView):
             optional_documents=json.dumps(optional_docs),
             notes=data.get('final_notes'),
         )
-        append_row(ONBOARDING_FILE, row)
-        return Response({'status': 'ok'}, status=status.HTTP_201_CREATED)
+        submission = submit_onboarding(candidate_id, category, file_payload, row)
+        return Response(submission, status=status.HTTP_202_ACCEPTED)
+
+
+class OnboardingStatusView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, submission_id):
+        record = read_status(submission_id)
+        if not record:
+            return Response({'error': 'Submission not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(public_status(record))
 
 
 class AttendanceListCreateView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        candidate_id = request.query_params.get("candidate_id")
-        rows = load_rows(ATTENDANCE_FILE)
-        if candidate_id:
-            rows = [row for row in rows if row.get("candidate_id") == candidate_id]
-        return Response({"attendance": rows})
+        date_range = {}
+        for param, bound in (("from", "start"), ("to", "end")):
+            value = request.query_params.get(param)
+            if value:
+                if not date_key(value):
+                    return Response({"error": f"Invalid {param} date."}, status=status.HTTP_400_BAD_REQUEST)
+                date_range[bound] = date_key(value)
+        return _hrms_page(request, ATTENDANCE_FILE, "attendance", ("candidate_id", "status"), **date_range)
 
     def post(self, request):
         required_fields = [
@@ -359,6 +421,10 @@ class AttendanceListCreateView(APIView):
         if not candidate_exists(candidate_id):
             return Response({"error": "Candidate not found."}, status=status.HTTP_400_BAD_REQUEST)
 
+        attendance_date = date_key(data.get("attendance_date"))
+        if not attendance_date:
+            return Response({"error": "Invalid attendance date."}, status=status.HTTP_400_BAD_REQUEST)
+
         allowed_status = {"Present", "Absent", "Leave", "Half Day", "Remote"}
         status_value = str(data.get("status")).strip()
         if status_value not in allowed_status:
@@ -368,12 +434,34 @@ class AttendanceListCreateView(APIView):
         row = build_attendance_row(
             attendance_id=attendance_id,
             candidate_id=candidate_id,
-            attendance_date=str(data.get("attendance_date")).strip(),
+            attendance_date=attendance_date,
             status=status_value,
             check_in_time=str(data.get("check_in_time", "")).strip(),
             check_out_time=str(data.get("check_out_time", "")).strip(),
             shift=str(data.get("shift", "")).strip(),
             notes=str(data.get("notes", "")).strip(),
         )
-        append_row(ATTENDANCE_FILE, row)
+        try:
+            append_row(ATTENDANCE_FILE, row)
+        except PartitionSealed:
+            return Response(
+                {"error": "Attendance for this month is closed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response({"attendance_id": attendance_id}, status=status.HTTP_201_CREATED)
+
+
+class AttendanceSummaryView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        months = {}
+        for param, bound in (("from", "start_month"), ("to", "end_month")):
+            value = request.query_params.get(param)
+            if value:
+                month = partition_month(f"{value[:7]}-01")
+                if not month:
+                    return Response({"error": f"Invalid {param} month."}, status=status.HTTP_400_BAD_REQUEST)
+                months[bound] = month
+        summaries = monthly_summary(candidate_id=request.query_params.get("candidate_id"), **months)
+        return Response({"summary": summaries})
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING
+
+from core.indexing import Index, QueryShape
+
+INDEXES = [
+    # Finance lists: entry-date range plus (date, _id) keyset pages.
+    Index('revenue_entries', (('date', ASCENDING), ('_id', ASCENDING))),
+    Index('expense_entries', (('date', ASCENDING), ('_id', ASCENDING))),
+    Index('payroll_records', (('month', ASCENDING), ('_id', ASCENDING))),
+    Index('budget_entries', (('fiscal_year', ASCENDING), ('_id', ASCENDING))),
+    Index('payroll_records', (('employee_code', ASCENDING), ('month', ASCENDING))),
+    Index('budget_entries', (('department', ASCENDING), ('fiscal_year', ASCENDING))),
+    Index('finance_rollups', (('kind', ASCENDING), ('period', ASCENDING), ('key', ASCENDING)), unique=True),
+]
+
+QUERIES = [
+    QueryShape(
+        'revenue_entries',
+        {'date': {'$gte': datetime(2024, 1, 1), '$lt': datetime(2024, 2, 1)}},
+        (('date', DESCENDING), ('_id', DESCENDING)),
+        'RevenueView.get',
+    ),
+    QueryShape(
+        'payroll_records',
+        {'month': {'$gte': '2024-01', '$lte': '2024-03'}},
+        (('month', ASCENDING), ('_id', ASCENDING)),
+        'PayrollView.get',
+    ),
+    QueryShape(
+        'payroll_records', {'employee_code': 'E001', 'month': '2024-01'}, source='core.imports (mode=upsert)'
+    ),
+    QueryShape(
+        'budget_entries', {'department': 'Operations', 'fiscal_year': '2024-25'}, source='core.imports (mode=upsert)'
+    ),
+    QueryShape(
+        'finance_rollups',
+        {'kind': {'$in': ['revenue', 'expenses']}, 'period': {'$gte': '2024-01', '$lte': '2024-12'}},
+        (('kind', ASCENDING), ('period', ASCENDING), ('key', ASCENDING)),
+        'ReportExportView.get',
+    ),
+]
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from finance.rollups import ROLLUP_SOURCES, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute finance_rollups from the revenue, expense, payroll and budget entries (stop finance writes first).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--collection', action='append', choices=sorted(ROLLUP_SOURCES), help='Only rebuild these collections.'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(options['collection'])
+        self.stdout.write(self.style.SUCCESS(f'{written} rollup rows written.'))
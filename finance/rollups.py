@@ -0,0 +1,168 @@
+"""Per-period finance totals kept in ``finance_rollups`` so reports never scan entries.
+
+One rollup document per ``(kind, period, key)``: ``period`` is the entry's
+month (``YYYY-MM``), or the fiscal year for budgets, and ``key`` the
+breakdown column (revenue source, expense category, budget department).
+Entries are added incrementally as they are written (upserts move the old
+version out first); ``rebuild_rollups`` recomputes a kind from scratch with a
+``$group`` aggregation.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+
+from pymongo import UpdateOne
+
+from core.db import get_collection
+
+ROLLUPS_COLLECTION = 'finance_rollups'
+
+# collection -> (kind, period field, breakdown field)
+ROLLUP_SOURCES = {
+    'revenue_entries': ('revenue', 'date', 'source'),
+    'expense_entries': ('expenses', 'date', 'category'),
+    'payroll_records': ('payroll', 'month', None),
+    'budget_entries': ('budgets', 'fiscal_year', 'department'),
+}
+MONTHLY_KINDS = ('revenue', 'expenses', 'payroll')
+
+
+def _amount(value):
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _period(document, period_field):
+    value = document.get(period_field)
+    if period_field == 'fiscal_year':
+        return '' if value in (None, '') else str(value)
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m')
+    if isinstance(value, str) and value:
+        return value[:7]
+    created_at = document.get('created_at')
+    return created_at.strftime('%Y-%m') if created_at else ''
+
+
+def _key(document, key_field):
+    value = document.get(key_field) if key_field else None
+    return '' if value in (None, '') else str(value)
+
+
+def record_entries(collection_name, documents):
+    """Add freshly inserted entries to their rollups (no-op for other collections)."""
+    record_changes(collection_name, (), documents)
+
+
+def record_changes(collection_name, removed, added):
+    """Move ``removed`` entry versions out of their rollups and ``added`` ones in.
+
+    Upserts pass the stored version of each overwritten entry as ``removed``
+    so a changed amount, month or breakdown column is applied as ``$inc``
+    deltas instead of recounting the collection.
+    """
+    source = ROLLUP_SOURCES.get(collection_name)
+    if not source or not (removed or added):
+        return
+    kind, period_field, key_field = source
+    totals = defaultdict(lambda: [0, 0])
+    for sign, documents in ((-1, removed), (1, added)):
+        for document in documents:
+            bucket = totals[(_period(document, period_field), _key(document, key_field))]
+            bucket[0] += sign * _amount(document.get('amount'))
+            bucket[1] += sign
+    now = datetime.utcnow()
+    requests = [
+        UpdateOne(
+            {'kind': kind, 'period': period, 'key': key},
+            {'$inc': {'total': total, 'count': count}, '$set': {'updated_at': now}},
+            upsert=True,
+        )
+        for (period, key), (total, count) in totals.items()
+        if total or count
+    ]
+    if requests:
+        get_collection(ROLLUPS_COLLECTION).bulk_write(requests, ordered=False)
+
+
+def rollup_fields(collection_name):
+    """Entry fields a rollup depends on, for fetching the old version before an overwrite."""
+    _, period_field, key_field = ROLLUP_SOURCES[collection_name]
+    return [field for field in ('amount', period_field, key_field, 'created_at') if field]
+
+
+def _group_pipeline(period_field, key_field):
+    if period_field == 'fiscal_year':
+        period = {'$ifNull': [{'$toString': '$fiscal_year'}, '']}
+    else:
+        period = {
+            '$switch': {
+                'branches': [
+                    {
+                        'case': {'$eq': [{'$type': f'${period_field}'}, 'date']},
+                        'then': {'$dateToString': {'format': '%Y-%m', 'date': f'${period_field}'}},
+                    },
+                    {
+                        'case': {'$eq': [{'$type': f'${period_field}'}, 'string']},
+                        'then': {'$substrCP': [f'${period_field}', 0, 7]},
+                    },
+                ],
+                'default': {'$ifNull': [{'$dateToString': {'format': '%Y-%m', 'date': '$created_at'}}, '']},
+            }
+        }
+    key = {'$ifNull': [{'$toString': f'${key_field}'}, '']} if key_field else ''
+    amount = {'$convert': {'input': '$amount', 'to': 'double', 'onError': 0, 'onNull': 0}}
+    return [
+        {'$group': {'_id': {'period': period, 'key': key}, 'total': {'$sum': amount}, 'count': {'$sum': 1}}},
+    ]
+
+
+def rebuild_rollups(collection_names=None):
+    """Recompute rollups for the given entry collections (all by default); returns rows written.
+
+    Totals are overwritten with ``$set``, so increments from entries written
+    while the aggregation runs are lost: run it for backfills and repairs
+    while finance writes and imports are stopped, never from request code.
+    """
+    rollups = get_collection(ROLLUPS_COLLECTION)
+    written = 0
+    for collection_name in collection_names or ROLLUP_SOURCES:
+        kind, period_field, key_field = ROLLUP_SOURCES[collection_name]
+        rebuilt_at = datetime.utcnow()
+        groups = get_collection(collection_name).aggregate(_group_pipeline(period_field, key_field), allowDiskUse=True)
+        requests = [
+            UpdateOne(
+                {'kind': kind, 'period': group['_id']['period'], 'key': group['_id']['key']},
+                {'$set': {'total': group['total'], 'count': group['count'], 'updated_at': rebuilt_at}},
+                upsert=True,
+            )
+            for group in groups
+        ]
+        if requests:
+            rollups.bulk_write(requests, ordered=False)
+        rollups.delete_many({'kind': kind, 'updated_at': {'$lt': rebuilt_at}})
+        written += len(requests)
+    return written
+
+
+def rollup_rows(kinds, start=None, end=None):
+    """Rollup documents for ``kinds``; monthly kinds are limited to ``start``..``end`` (YYYY-MM)."""
+    query = {'kind': {'$in': list(kinds)}}
+    if start or end:
+        period = {}
+        if start:
+            period['$gte'] = start
+        if end:
+            period['$lte'] = end
+        query = {
+            '$or': [
+                {'kind': {'$in': [kind for kind in kinds if kind in MONTHLY_KINDS]}, 'period': period},
+                {'kind': {'$in': [kind for kind in kinds if kind not in MONTHLY_KINDS]}},
+            ]
+        }
+    return get_collection(ROLLUPS_COLLECTION).find(query, {'_id': 0}).sort([('kind', 1), ('period', 1), ('key', 1)])
@@ -1,27 +1,195 @@
-from datetime import datetime
+import json
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
 
+from bson import ObjectId
+from django.conf import settings
+from pymongo import ASCENDING, DESCENDING
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.permissions import FinanceOnly, RoleAnyPermission
-from core.db import get_collection
+from core.db import get_collection, with_string_ids
 from core.excel import workbook_from_rows, excel_response
+from core.export import EXPORT_FORMATS, export_response
+from core.imports import COERCERS, MODULE_COLLECTIONS, MODULE_SCHEMAS
+from finance.rollups import MONTHLY_KINDS, ROLLUP_SOURCES, record_entries, rollup_rows
+
+
+FIELD_PATTERN = re.compile(r'^[A-Za-z0-9_]+$')
+MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+REPORT_KINDS = ('revenue', 'expenses', 'payroll', 'budgets')
+
+
+# Business field each finance list is ordered by and ``from``/``to`` filter on.
+LIST_RANGE_FIELDS = {name: period_field for name, (_, period_field, _) in ROLLUP_SOURCES.items()}
+COLLECTION_MODULES = {collection: module for module, collection in MODULE_COLLECTIONS.items()}
+
+
+def _parse_day(params, param):
+    value = params.get(param)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f'{param} must be a date in YYYY-MM-DD format.') from None
+
+
+def _range_filter(field, start, end):
+    """``from``/``to`` days as bounds in the field's stored form (date, month or fiscal year)."""
+    bounds = {}
+    if field == 'date':
+        if start:
+            bounds['$gte'] = start
+        if end:
+            bounds['$lt'] = end + timedelta(days=1)
+    elif field == 'month':
+        if start:
+            bounds['$gte'] = start.strftime('%Y-%m')
+        if end:
+            bounds['$lte'] = end.strftime('%Y-%m')
+    else:
+        # Fiscal years ('2024' or '2024-25') are kept by the year they start in.
+        if start:
+            bounds['$gte'] = str(start.year)
+        if end:
+            bounds['$lt'] = str(end.year + 1)
+    return {field: bounds} if bounds else {}
+
+
+def _encode_after(value, object_id):
+    if isinstance(value, datetime):
+        value = {'date': value.isoformat()}
+    payload = json.dumps({'id': str(object_id), 'value': value})
+    return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_after(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(urlsafe_b64decode(padded.encode()).decode())
+        value = payload['value']
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['date'])
+        return value, ObjectId(payload['id'])
+    except Exception:
+        raise ValueError('after must be a next_cursor value.') from None
+
+
+def _after_filter(field, value, object_id, descending):
+    """Documents strictly past ``(value, object_id)`` in ``(field, _id)`` order."""
+    beyond = '$lt' if descending else '$gt'
+    clauses = [{field: value, '_id': {beyond: object_id}}]
+    # Missing values sort first: they only follow a cursor in descending order.
+    if value is None:
+        if not descending:
+            clauses.append({field: {'$ne': None}})
+    else:
+        clauses.append({field: {beyond: value}})
+        if descending:
+            clauses.append({field: None})
+    return {'$or': clauses}
+
+
+def _list_query(collection_name, params):
+    """Build the filter, projection and sort for a finance list.
+
+    ``from``/``to`` (YYYY-MM-DD) bound the entry's own date (``date``,
+    ``month`` or ``fiscal_year``), and pages are keyset on that field plus
+    ``_id``, so every page is a range scan of the matching compound index.
+    """
+    field = LIST_RANGE_FIELDS[collection_name]
+    clauses = []
+    date_range = _range_filter(field, _parse_day(params, 'from'), _parse_day(params, 'to'))
+    if date_range:
+        clauses.append(date_range)
+    descending = params.get('order') == 'desc'
+    after = params.get('after')
+    if after:
+        clauses.append(_after_filter(field, *_decode_after(after), descending))
+    fields = [name.strip() for name in params.get('fields', '').split(',') if name.strip()]
+    invalid = [name for name in fields if not FIELD_PATTERN.match(name)]
+    if invalid:
+        raise ValueError(f"Invalid fields: {', '.join(invalid)}")
+    query = clauses[0] if len(clauses) == 1 else {'$and': clauses} if clauses else {}
+    projection = dict.fromkeys(fields, 1) or None
+    direction = DESCENDING if descending else ASCENDING
+    return query, projection, [(field, direction), ('_id', direction)]
 
 
 def _list_or_export(collection_name, request):
-    items = list(get_collection(collection_name).find())
-    for item in items:
-        item['id'] = str(item.pop('_id'))
-    if request.query_params.get('export') == 'true':
-        workbook = workbook_from_rows(items)
-        return excel_response(workbook, f'{collection_name}.xlsx')
-    return Response({'results': items})
+    params = request.query_params
+    try:
+        query, projection, sort = _list_query(collection_name, params)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    export_format = params.get('export')
+    if export_format in EXPORT_FORMATS:
+        cursor = get_collection(collection_name).find(query, projection).sort(sort)
+        return export_response(cursor, export_format, collection_name)
+    try:
+        limit = int(params.get('limit', settings.FINANCE_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'limit must be positive.'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, settings.FINANCE_MAX_PAGE_SIZE)
+    field = sort[0][0]
+    # The cursor needs the sort field even when ``fields`` leaves it out.
+    hidden = projection is not None and field not in projection
+    if hidden:
+        projection = {**projection, field: 1}
+    documents = list(get_collection(collection_name).find(query, projection).sort(sort).limit(limit))
+    next_cursor = None
+    if len(documents) == limit:
+        next_cursor = _encode_after(documents[-1].get(field), documents[-1]['_id'])
+    if hidden:
+        for document in documents:
+            document.pop(field, None)
+    return Response({'results': list(with_string_ids(documents)), 'next_cursor': next_cursor})
 
 
-def _create(collection_name, payload):
+def _create(collection_name, payload, message):
+    """Insert an entry, storing its date field in the same form imports use."""
+    module = COLLECTION_MODULES[collection_name]
+    field = LIST_RANGE_FIELDS[collection_name]
+    if payload.get(field) not in (None, ''):
+        try:
+            payload[field] = COERCERS[MODULE_SCHEMAS[module][field]](payload[field])
+        except ValueError as exc:
+            return Response({'error': f'{field}: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
     payload['created_at'] = datetime.utcnow()
     get_collection(collection_name).insert_one(payload)
+    record_entries(collection_name, [payload])
+    return Response({'message': message}, status=status.HTTP_201_CREATED)
+
+
+def _summary_report(start, end):
+    totals = {kind: [0, 0] for kind in REPORT_KINDS}
+    for row in rollup_rows(REPORT_KINDS, start, end):
+        totals[row['kind']][0] += row['total']
+        totals[row['kind']][1] += row['count']
+    data = []
+    for kind in REPORT_KINDS:
+        data.append({'metric': f'total_{kind}', 'value': totals[kind][0]})
+        data.append({'metric': f'{kind}_entries', 'value': totals[kind][1]})
+    net_income = totals['revenue'][0] - totals['expenses'][0] - totals['payroll'][0]
+    data.append({'metric': 'net_income', 'value': net_income})
+    return data
+
+
+def _monthly_report(start, end):
+    months = {}
+    for row in rollup_rows(MONTHLY_KINDS, start, end):
+        month = months.setdefault(row['period'], dict.fromkeys(MONTHLY_KINDS, 0))
+        month[row['kind']] += row['total']
+    return [
+        {'month': period, **totals, 'net': totals['revenue'] - totals['expenses'] - totals['payroll']}
+        for period, totals in sorted(months.items())
+    ]
 
 
 class RevenueView(APIView):
@@ -31,8 +199,7 @@ class RevenueView(APIView):
         return _list_or_export('revenue_entries', request)
 
     def post(self, request):
-        _create('revenue_entries', request.data.copy())
-        return Response({'message': 'Revenue entry created.'}, status=status.HTTP_201_CREATED)
+        return _create('revenue_entries', request.data.copy(), 'Revenue entry created.')
 
 
 class ExpenseView(APIView):
@@ -42,8 +209,7 @@ class ExpenseView(APIView):
         return _list_or_export('expense_entries', request)
 
     def post(self, request):
-        _create('expense_entries', request.data.copy())
-        return Response({'message': 'Expense entry created.'}, status=status.HTTP_201_CREATED)
+        return _create('expense_entries', request.data.copy(), 'Expense entry created.')
 
 
 class PayrollView(APIView):
@@ -53,8 +219,7 @@ class PayrollView(APIView):
         return _list_or_export('payroll_records', request)
 
     def post(self, request):
-        _create('payroll_records', request.data.copy())
-        return Response({'message': 'Payroll record created.'}, status=status.HTTP_201_CREATED)
+        return _create('payroll_records', request.data.copy(), 'Payroll record created.')
 
 
 class BudgetView(APIView):
@@ -64,8 +229,7 @@ class BudgetView(APIView):
         return _list_or_export('budget_entries', request)
 
     def post(self, request):
-        _create('budget_entries', request.data.copy())
-        return Response({'message': 'Budget entry created.'}, status=status.HTTP_201_CREATED)
+        return _create('budget_entries', request.data.copy(), 'Budget entry created.')
 
 
 class ReportExportView(APIView):
@@ -74,9 +238,21 @@ class ReportExportView(APIView):
 
     def get(self, request):
         report_type = request.query_params.get('type', 'summary')
-        data = [
-            {'metric': 'total_revenue', 'value': get_collection('revenue_entries').count_documents({})},
-            {'metric': 'total_expenses', 'value': get_collection('expense_entries').count_documents({})},
-        ]
+        start = request.query_params.get('from')
+        end = request.query_params.get('to')
+        for value in (start, end):
+            if value and not MONTH_PATTERN.match(value):
+                return Response({'error': 'from/to must be months in YYYY-MM format.'}, status=status.HTTP_400_BAD_REQUEST)
+        if report_type == 'summary':
+            data = _summary_report(start, end)
+        elif report_type == 'monthly':
+            data = _monthly_report(start, end)
+        elif report_type in REPORT_KINDS:
+            data = [
+                {'period': row['period'], 'key': row['key'], 'total': row['total'], 'count': row['count']}
+                for row in rollup_rows([report_type], start, end)
+            ]
+        else:
+            return Response({'error': 'Unknown report type.'}, status=status.HTTP_400_BAD_REQUEST)
         workbook = workbook_from_rows(data)
         return excel_response(workbook, f'{report_type}_report.xlsx')
@@ -0,0 +1,15 @@
+"""Gunicorn settings picked up automatically from the project root."""
+import logging
+
+logger = logging.getLogger('gunicorn.error')
+
+
+def post_worker_init(worker):
+    # Runs in each worker after the app is loaded and before it accepts
+    # connections, so requests after a deploy or recycle find a warm pool.
+    from core.db import warm_up_client
+
+    try:
+        warm_up_client()
+    except Exception as exc:
+        logger.warning('MongoDB warm-up failed in worker %s: %s', worker.pid, exc)
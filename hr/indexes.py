@@ -0,0 +1,16 @@
+from pymongo import ASCENDING
+
+from core.indexing import Index, QueryShape
+
+INDEXES = [
+    Index('employees', (('employee_code', ASCENDING),), unique=True),
+    Index('employees', (('status', ASCENDING),)),
+    Index('employees', (('approval_stage', ASCENDING),)),
+    Index('salary_limits', (('designation', ASCENDING),), unique=True),
+]
+
+QUERIES = [
+    QueryShape('salary_limits', {'designation': 'Manager'}, source='EmployeeListCreateView.post'),
+    QueryShape('employees', {'status': 'ACTIVE'}, source='HRDashboardView.get'),
+    QueryShape('employees', {'approval_stage': 'FINANCE_REVIEW'}, source='HRDashboardView.get'),
+]
@@ -6,8 +6,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.permissions import HROnly, MakerOnly, RoleAnyPermission
-from core.db import get_collection
-from core.excel import workbook_from_rows, excel_response
+from core.db import get_collection, with_string_ids
+from core.export import EXPORT_FORMATS, export_response
 
 
 def _mask_aadhaar(value):
@@ -23,13 +23,11 @@ class EmployeeListCreateView(APIView):
     permission_classes = [HROnly]
 
     def get(self, request):
-        employees = list(get_collection('employees').find())
-        for item in employees:
-            item['id'] = str(item.pop('_id'))
-        if request.query_params.get('export') == 'true':
-            workbook = workbook_from_rows(employees)
-            return excel_response(workbook, 'employees.xlsx')
-        return Response({'results': employees})
+        cursor = get_collection('employees').find()
+        export_format = request.query_params.get('export')
+        if export_format in EXPORT_FORMATS:
+            return export_response(cursor, export_format, 'employees')
+        return Response({'results': list(with_string_ids(cursor))})
 
     def post(self, request):
         payload = request.data.copy()
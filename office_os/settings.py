@@ -44,6 +44,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'core.middleware.RequestIDMiddleware',
+    'core.middleware.MongoTimingMiddleware',
     'core.middleware.ErrorHandlingMiddleware',
 ]
 
@@ -120,11 +121,45 @@ CORS_ALLOW_ALL_ORIGINS = os.getenv('CORS_ALLOW_ALL_ORIGINS', 'true').lower() ==
 
 MONGO_URI = os.getenv('MONGO_URI')
 MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'doggzi_office_os')
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', '4'))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', '0'))
+MONGO_COMMAND_METRICS = os.getenv('MONGO_COMMAND_METRICS', 'true').lower() == 'true'
+MONGO_SLOW_COMMAND_MS = int(os.getenv('MONGO_SLOW_COMMAND_MS', '100'))
+
+USER_CACHE_TTL_SECONDS = int(os.getenv('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv('USER_CACHE_NEGATIVE_TTL_SECONDS', '10'))
+USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', '10000'))
+AUTH_STATELESS = os.getenv('AUTH_STATELESS', 'false').lower() == 'true'
+AUTH_REVOCATION_REFRESH_SECONDS = int(os.getenv('AUTH_REVOCATION_REFRESH_SECONDS', '30'))
 
 RECRUITMENT_INTERVIEWER_PIN = os.getenv('RECRUITMENT_INTERVIEWER_PIN', '1234')
 RECRUITMENT_HR_PIN = os.getenv('RECRUITMENT_HR_PIN', '5678')
 RECRUITMENT_ADMIN_PIN = os.getenv('RECRUITMENT_ADMIN_PIN', '9999')
 
+HRMS_JOURNAL_MAX_BYTES = int(os.getenv('HRMS_JOURNAL_MAX_BYTES', str(4 * 1024 * 1024)))
+HRMS_JOURNAL_FSYNC = os.getenv('HRMS_JOURNAL_FSYNC', 'true').lower() == 'true'
+HRMS_GROUP_COMMIT_WINDOW_MS = int(os.getenv('HRMS_GROUP_COMMIT_WINDOW_MS', '0'))
+HRMS_ATTENDANCE_SEAL_AFTER_DAYS = int(os.getenv('HRMS_ATTENDANCE_SEAL_AFTER_DAYS', '7'))
+HRMS_PAGE_SIZE = int(os.getenv('HRMS_PAGE_SIZE', '100'))
+HRMS_MAX_PAGE_SIZE = int(os.getenv('HRMS_MAX_PAGE_SIZE', '1000'))
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', '4'))
+BACKGROUND_QUEUE_SIZE = int(os.getenv('BACKGROUND_QUEUE_SIZE', '64'))
+
+HRMS_MONGO_DUAL_WRITE = os.getenv('HRMS_MONGO_DUAL_WRITE', 'false').lower() == 'true'
+HRMS_MONGO_READS = os.getenv('HRMS_MONGO_READS', 'false').lower() == 'true'
+
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', '1000'))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv('IMPORT_MAX_REPORTED_ERRORS', '100'))
+IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', '1'))
+IMPORT_QUEUE_SIZE = int(os.getenv('IMPORT_QUEUE_SIZE', '2'))
+TEMPLATE_CACHE_MAX_AGE = int(os.getenv('TEMPLATE_CACHE_MAX_AGE', '3600'))
+FINANCE_PAGE_SIZE = int(os.getenv('FINANCE_PAGE_SIZE', '100'))
+FINANCE_MAX_PAGE_SIZE = int(os.getenv('FINANCE_MAX_PAGE_SIZE', '1000'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -7,9 +7,12 @@ from core.views import (
     health_view,
     TemplateDownloadView,
     ImportModuleView,
+    ImportJobView,
     CandidateListCreateView,
     OnboardingCreateView,
+    OnboardingStatusView,
     AttendanceListCreateView,
+    AttendanceSummaryView,
 )
 
 urlpatterns = [
@@ -22,10 +25,13 @@ urlpatterns = [
     path('api/', include('finance.urls')),
     path('api/', include('companies.urls')),
     path('api/templates/<str:module>', TemplateDownloadView.as_view(), name='templates'),
+    path('api/import/jobs/<str:job_id>', ImportJobView.as_view(), name='import-job'),
     path('api/import/<str:module>', ImportModuleView.as_view(), name='import'),
     path('api/hrms/candidates', CandidateListCreateView.as_view(), name='hrms-candidates'),
     path('api/hrms/onboarding', OnboardingCreateView.as_view(), name='hrms-onboarding'),
+    path('api/hrms/onboarding/<str:submission_id>', OnboardingStatusView.as_view(), name='hrms-onboarding-status'),
     path('api/hrms/attendance', AttendanceListCreateView.as_view(), name='hrms-attendance'),
+    path('api/hrms/attendance/summary', AttendanceSummaryView.as_view(), name='hrms-attendance-summary'),
     path('api/schema', SpectacularAPIView.as_view(), name='schema'),
     path('docs', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('redoc', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
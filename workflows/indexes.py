@@ -0,0 +1,8 @@
+from pymongo import ASCENDING
+
+from core.indexing import Index
+
+INDEXES = [
+    Index('appraisals', (('status', ASCENDING),)),
+    Index('promotions', (('status', ASCENDING),)),
+]